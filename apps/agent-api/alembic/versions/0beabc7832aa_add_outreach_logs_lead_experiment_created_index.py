@@ -0,0 +1,33 @@
+"""add_outreach_logs_lead_experiment_created_index
+
+Revision ID: 0beabc7832aa
+Revises: ac6127a7995f
+Create Date: 2026-10-15 22:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0beabc7832aa'
+down_revision: Union[str, Sequence[str], None] = 'ac6127a7995f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_outreach_logs_lead_experiment_created',
+        'outreach_logs',
+        ['lead_id', 'experiment_id', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outreach_logs_lead_experiment_created', table_name='outreach_logs')
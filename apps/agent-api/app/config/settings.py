@@ -14,19 +14,29 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_reload: bool = True
+    cors_origins: str = "http://localhost:3000"  # Comma-separated list
 
     # Database
     database_url: str = f"sqlite:///{DEFAULT_DB_PATH.as_posix()}"
+    enable_copy_fast_path: bool = False  # PostgreSQL COPY for large lead scorer batches
 
     # Redpanda/Kafka
     redpanda_brokers: str = "localhost:19092"
     kafka_topic_leads_raw: str = "leads.raw"
     kafka_topic_leads_scored: str = "leads.scored"
     kafka_topic_outreach_events: str = "outreach.events"
+    kafka_topic_outreach_events_dlq: str = "outreach.events.dlq"
+    kafka_topic_leads_dlq: str = "leads.dlq"
+    kafka_batch_size: int = 100  # Max messages per consume() call
+    kafka_fetch_wait_max_ms: int = 500  # Max time the broker holds a fetch waiting for fetch.min.bytes
+    kafka_poll_timeout_ms: int = 750  # consume() timeout, ~1.5x the fetch wait so one fetch fits in a call
+    include_raw_in_scored_event: bool = True  # Copy the raw lead payload into leads.scored events
 
     # Sentry
     sentry_dsn_python: str | None = None
     sentry_environment: str = "development"
+    sentry_traces_sample_rate: float = 0.1
+    sentry_profiles_sample_rate: float = 0.1
 
     # Lightfield CRM
     lightfield_api_key: str | None = None
@@ -37,6 +47,11 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4o-mini"
     openai_base_url: str = "https://api.openai.com/v1"
     openai_timeout_seconds: float = 30.0
+    openai_max_concurrency: int = 16  # In-flight scoring calls per worker
+    openai_batch_mode: bool = False  # Score via the Batch API (backfills; up to 24h turnaround)
+    openai_batch_max_leads: int = 1000
+    openai_batch_window_seconds: float = 300.0
+    openai_batch_poll_seconds: float = 30.0
 
     # Truefoundry
     truefoundry_api_key: str | None = None
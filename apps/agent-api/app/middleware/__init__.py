@@ -0,0 +1,4 @@
+"""ASGI middleware for Pipeline Whisperer"""
+from .gzip import PROBE_PATH_PREFIXES, ProbeAwareGZipMiddleware
+
+__all__ = ["PROBE_PATH_PREFIXES", "ProbeAwareGZipMiddleware"]
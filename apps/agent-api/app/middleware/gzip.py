@@ -0,0 +1,29 @@
+"""GZip middleware that leaves health/metrics probe responses uncompressed"""
+from typing import Tuple
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Endpoints polled by Docker/kube probes and Prometheus
+PROBE_PATH_PREFIXES: Tuple[str, ...] = ("/health", "/metrics")
+
+
+class ProbeAwareGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that bypasses compression for probe endpoints"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 2048,
+        # zlib level 1 gets most of the size win on JSON for a fraction of level 9's CPU
+        compresslevel: int = 1,
+        skip_path_prefixes: Tuple[str, ...] = PROBE_PATH_PREFIXES,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.skip_path_prefixes = skip_path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.skip_path_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -8,6 +8,8 @@ engine = create_engine(
     settings.database_url,
     echo=settings.log_level == "DEBUG",
     future=True,
+    pool_pre_ping=True,  # Long-lived worker sessions survive DB restarts/idle disconnects
+    insertmanyvalues_page_size=1000,  # Rows per multi-VALUES INSERT in bulk executemany
 )
 
 # Session factory
@@ -1,5 +1,6 @@
 """Experiment model - tracks A/B tests and learning iterations"""
 from datetime import datetime
+from typing import Any, Dict
 from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Boolean
 from sqlalchemy.sql import func
 from .base import Base
@@ -46,9 +47,31 @@ class Experiment(Base):
     def __repr__(self):
         return f"<Experiment {self.experiment_id}: {self.name} ({self.conversion_rate:.2%})>"
 
+    @staticmethod
+    def metric_rates(conversions, leads_assigned, responses_received, outreach_sent) -> Dict[str, Any]:
+        """
+        conversion_rate/response_rate for the given counters, keyed by column
+
+        Counters may be plain numbers or SQL expressions (SQLAlchemy's / is true
+        division), so update_metrics() and atomic UPDATE statements share one formula.
+        A rate whose denominator is a known zero is left out.
+        """
+        rates = {}
+        if _may_be_positive(leads_assigned):
+            rates["conversion_rate"] = conversions / leads_assigned
+        if _may_be_positive(outreach_sent):
+            rates["response_rate"] = responses_received / outreach_sent
+        return rates
+
     def update_metrics(self):
         """Recalculate performance metrics"""
-        if self.leads_assigned > 0:
-            self.conversion_rate = self.conversions / self.leads_assigned
-        if self.outreach_sent > 0:
-            self.response_rate = self.responses_received / self.outreach_sent
+        rates = self.metric_rates(
+            self.conversions, self.leads_assigned, self.responses_received, self.outreach_sent
+        )
+        for column, rate in rates.items():
+            setattr(self, column, rate)
+
+
+def _may_be_positive(count) -> bool:
+    """Plain counts must be positive; SQL expressions are only known at execution time"""
+    return not isinstance(count, (int, float)) or count > 0
@@ -1,6 +1,6 @@
 """Outreach log model - tracks all sent outreach messages"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 import enum
 from .base import Base
@@ -22,6 +22,15 @@ class OutreachStatus(str, enum.Enum):
 class OutreachLog(Base):
     """Log of all outreach messages sent to leads"""
     __tablename__ = "outreach_logs"
+    __table_args__ = (
+        # Latest log per lead/experiment (feedback loop lookup)
+        Index(
+            "ix_outreach_logs_lead_experiment_created",
+            "lead_id",
+            "experiment_id",
+            "created_at",
+        ),
+    )
 
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,14 @@
+"""JSON response class rendered with orjson"""
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+class OrjsonResponse(Response):
+    """Response that renders content with orjson (C encoder, native datetime support)"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
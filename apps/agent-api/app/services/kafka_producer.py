@@ -1,7 +1,7 @@
 """Kafka producer service for publishing events to Redpanda"""
-import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import orjson
 from confluent_kafka import Producer
 from confluent_kafka.error import KafkaException
 import sentry_sdk
@@ -12,7 +12,13 @@ logger = logging.getLogger(__name__)
 
 
 class KafkaProducerService:
-    """Kafka producer for publishing lead events to Redpanda"""
+    """
+    Kafka producer for publishing lead events to Redpanda
+
+    Messages are batched by librdkafka (linger.ms/batch.size), so publish
+    calls only enqueue. Callers must call flush() (or close()) before exiting
+    or queued messages may be lost.
+    """
 
     def __init__(self):
         """Initialize Kafka producer"""
@@ -22,9 +28,13 @@ class KafkaProducerService:
             'acks': 'all',  # Wait for all replicas
             'retries': 3,
             'max.in.flight.requests.per.connection': 5,
+            # Coalesce bursts of produce() calls into fewer, compressed requests
+            'linger.ms': 100,
+            'batch.size': 1048576,
+            'compression.type': 'lz4',
         }
         self.producer = Producer(self.config)
-        logger.info(f"Kafka producer initialized: {settings.redpanda_brokers}")
+        logger.info("Kafka producer initialized: %s", settings.redpanda_brokers)
 
     def delivery_report(self, err, msg):
         """Callback for message delivery reports"""
@@ -34,7 +44,7 @@ class KafkaProducerService:
             sentry_sdk.capture_message(error_msg, level="error")
         else:
             logger.debug(
-                f"Message delivered to {msg.topic()} [{msg.partition()}] @ offset {msg.offset()}"
+                "Message delivered to %s [%s] @ offset %s", msg.topic(), msg.partition(), msg.offset()
             )
 
     def publish_lead(self, lead_data: Dict[str, Any]) -> bool:
@@ -49,7 +59,7 @@ class KafkaProducerService:
         """
         try:
             # Serialize to JSON
-            message = json.dumps(lead_data).encode('utf-8')
+            message = orjson.dumps(lead_data)
 
             # Use lightfield_id as key for partitioning
             key = lead_data.get('lightfield_id', '').encode('utf-8')
@@ -65,17 +75,15 @@ class KafkaProducerService:
             # Trigger delivery reports
             self.producer.poll(0)
 
-            logger.info(f"Published lead to Kafka: {lead_data.get('lightfield_id')}")
+            logger.info("Published lead to Kafka: %s", lead_data.get('lightfield_id'))
             return True
 
         except KafkaException as e:
-            error_msg = f"Kafka error publishing lead: {e}"
-            logger.error(error_msg)
+            logger.error("Kafka error publishing lead: %s", e)
             sentry_sdk.capture_exception(e)
             return False
         except Exception as e:
-            error_msg = f"Unexpected error publishing lead: {e}"
-            logger.error(error_msg)
+            logger.error("Unexpected error publishing lead: %s", e)
             sentry_sdk.capture_exception(e)
             return False
 
@@ -90,7 +98,7 @@ class KafkaProducerService:
             bool: True if successfully queued, False otherwise
         """
         try:
-            message = json.dumps(lead_data).encode('utf-8')
+            message = orjson.dumps(lead_data)
             key = lead_data.get('lightfield_id', '').encode('utf-8')
 
             self.producer.produce(
@@ -101,26 +109,67 @@ class KafkaProducerService:
             )
 
             self.producer.poll(0)
-            logger.info(f"Published scored lead to Kafka: {lead_data.get('lightfield_id')}")
+            logger.info("Published scored lead to Kafka: %s", lead_data.get('lightfield_id'))
             return True
 
         except Exception as e:
-            logger.error(f"Error publishing scored lead: {e}")
+            logger.error("Error publishing scored lead: %s", e)
             sentry_sdk.capture_exception(e)
             return False
 
-    def flush(self, timeout: float = 10.0):
+    def publish_dead_letter(
+        self,
+        value: bytes,
+        key: Optional[bytes],
+        error: str,
+        topic: Optional[str] = None,
+    ) -> bool:
+        """
+        Publish a message that could not be processed to a dead-letter topic
+
+        Args:
+            value: Original message payload
+            key: Original message key
+            error: Reason processing failed (sent as the "error" header)
+            topic: Dead-letter topic (defaults to leads.dlq)
+
+        Returns:
+            bool: True if successfully queued, False otherwise
+        """
+        try:
+            self.producer.produce(
+                topic=topic or settings.kafka_topic_leads_dlq,
+                key=key,
+                value=value,
+                headers=[("error", error.encode('utf-8'))],
+                callback=self.delivery_report
+            )
+
+            self.producer.poll(0)
+            logger.warning("Dead-lettered message %s: %s", key, error)
+            return True
+
+        except Exception as e:
+            logger.error("Error publishing dead letter: %s", e)
+            sentry_sdk.capture_exception(e)
+            return False
+
+    def flush(self, timeout: float = 10.0) -> int:
         """
         Wait for all messages to be delivered
 
         Args:
             timeout: Maximum time to wait in seconds
+
+        Returns:
+            int: Number of messages still undelivered
         """
         remaining = self.producer.flush(timeout)
         if remaining > 0:
-            logger.warning(f"{remaining} messages were not delivered within timeout")
+            logger.warning("%d messages were not delivered within timeout", remaining)
         else:
-            logger.info("All messages delivered successfully")
+            logger.debug("All messages delivered successfully")
+        return remaining
 
     def close(self):
         """Close the producer and flush pending messages"""
@@ -4,6 +4,7 @@ Handles email/LinkedIn messaging via Lightfield platform
 """
 import os
 import logging
+import uuid
 import httpx
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
@@ -126,8 +127,6 @@ class LightfieldClient:
         tracking_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Mock email sending for testing/demo"""
-        import uuid
-
         message_id = f"lf_msg_{uuid.uuid4().hex[:16]}"
 
         logger.info(
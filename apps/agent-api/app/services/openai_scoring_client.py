@@ -6,9 +6,12 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, Optional
+import random
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 import httpx
+import orjson
 
 try:
     from app.config.settings import settings as app_settings
@@ -19,6 +22,13 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "gpt-4o-mini"
 DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+@lru_cache(maxsize=4096)
+def _mock_jitter(company_name: str) -> float:
+    """Deterministic per-company jitter (seeding a Random is the mock path's main cost)"""
+    return random.Random(company_name).uniform(-0.05, 0.05)
 
 
 class OpenAIScoringClient:
@@ -48,17 +58,20 @@ class OpenAIScoringClient:
         else:
             self.mock_mode = False
 
-        headers = {
-            "Content-Type": "application/json",
-        }
+        # No default Content-Type: httpx sets it per request (JSON bodies or
+        # the multipart upload used by the Batch API)
+        headers: Dict[str, str] = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
+        self._headers = headers
 
         self.client = httpx.Client(
             base_url=self.base_url,
             headers=headers,
             timeout=self.timeout,
         )
+        # Created lazily on first async call so it binds to the caller's event loop
+        self.async_client: Optional[httpx.AsyncClient] = None
 
     # JSON schema for structured response (score + persona + reasoning)
     RESPONSE_SCHEMA: Dict[str, Any] = {
@@ -76,6 +89,54 @@ class OpenAIScoringClient:
         if self.mock_mode:
             return self._mock_score_lead(lead_payload)
 
+        try:
+            logger.debug("Calling OpenAI Chat Completions API")
+            response = self.client.post("/chat/completions", json=self._build_request(lead_payload))
+            return self._handle_response(response, lead_payload)
+
+        except Exception as exc:  # noqa: BLE001 - broadened to ensure fallback
+            logger.error("OpenAI scoring failed: %s", exc, exc_info=True)
+            return self._mock_score_lead(lead_payload)
+
+    async def score_lead_async(self, lead_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of score_lead for scoring many leads concurrently"""
+        if self.mock_mode:
+            return self._mock_score_lead(lead_payload)
+
+        if self.async_client is None:
+            # Keep one warm connection per in-flight request; httpx's default of
+            # 20 keep-alive connections churns TCP/TLS handshakes at higher concurrency
+            max_concurrency = (
+                app_settings.openai_max_concurrency if app_settings
+                else int(os.getenv("OPENAI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+            )
+            self.async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                ),
+            )
+
+        try:
+            logger.debug("Calling OpenAI Chat Completions API (async)")
+            response = await self.async_client.post("/chat/completions", json=self._build_request(lead_payload))
+            return self._handle_response(response, lead_payload)
+
+        except Exception as exc:  # noqa: BLE001 - broadened to ensure fallback
+            logger.error("OpenAI scoring failed: %s", exc, exc_info=True)
+            return self._mock_score_lead(lead_payload)
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened"""
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+
+    def _build_request(self, lead_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Chat Completions request body for a lead"""
         system_prompt = (
             "You are an expert B2B lead qualification system. Analyze company data and return a JSON object with:\n"
             "- score: number between 0.0 and 1.0 (lead quality)\n"
@@ -90,7 +151,7 @@ class OpenAIScoringClient:
 
         user_prompt = self._build_prompt(lead_payload)
 
-        request = {
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
@@ -100,37 +161,100 @@ class OpenAIScoringClient:
             "temperature": 0.3,
         }
 
-        try:
-            logger.debug("Calling OpenAI Chat Completions API")
-            response = self.client.post("/chat/completions", json=request)
-            response.raise_for_status()
-            data = response.json()
-
-            result = self._extract_from_response(data)
-            if result is None:
-                raise ValueError("Structured response missing expected fields")
-
-            logger.info(
-                "Lead scored via OpenAI: %s -> %.2f (%s)",
-                lead_payload.get("company_name", "unknown"),
-                result["score"],
-                result["persona"],
-            )
-            result["mock"] = False
-            return result
+    def build_batch_line(self, custom_id: str, lead_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Build one Batch API input line (a Chat Completions request) for a lead"""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._build_request(lead_payload),
+        }
 
-        except Exception as exc:  # noqa: BLE001 - broadened to ensure fallback
-            logger.error("OpenAI scoring failed: %s", exc, exc_info=True)
-            return self._mock_score_lead(lead_payload)
+    def submit_batch(self, lines: List[Dict[str, Any]]) -> str:
+        """
+        Upload batch input lines as JSONL and start a Batch API job
+
+        Args:
+            lines: Request lines from build_batch_line
+
+        Returns:
+            Batch job ID
+        """
+        jsonl = b"\n".join(orjson.dumps(line) for line in lines)
+
+        upload = self.client.post(
+            "/files",
+            data={"purpose": "batch"},
+            files={"file": ("leads.jsonl", jsonl, "application/jsonl")},
+        )
+        upload.raise_for_status()
+
+        response = self.client.post(
+            "/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        response.raise_for_status()
+        batch = response.json()
+        logger.info("Submitted OpenAI batch %s (%d leads)", batch["id"], len(lines))
+        return batch["id"]
+
+    def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """Fetch a Batch API job (status, output_file_id, ...)"""
+        response = self.client.get(f"/batches/{batch_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_batch_results(self, output_file_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Download a finished batch's output and parse it by custom_id
+
+        Lines that errored or lack the expected fields are omitted, so callers
+        can fall back for those leads.
+        """
+        response = self.client.get(f"/files/{output_file_id}/content")
+        response.raise_for_status()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for line in response.content.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            body = (item.get("response") or {}).get("body")
+            result = self._extract_from_response(body) if body else None
+            if result is not None:
+                result["mock"] = False
+                results[item["custom_id"]] = result
+        return results
+
+    def _handle_response(self, response: httpx.Response, lead_payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate an HTTP response and return the structured scoring result"""
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        result = self._extract_from_response(data)
+        if result is None:
+            raise ValueError("Structured response missing expected fields")
+
+        logger.info(
+            "Lead scored via OpenAI: %s -> %.2f (%s)",
+            lead_payload.get("company_name", "unknown"),
+            result["score"],
+            result["persona"],
+        )
+        result["mock"] = False
+        return result
 
     def _extract_from_response(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Pull structured JSON from Chat Completions API response"""
-        import json
         try:
             # Extract the message content from Chat Completions format
             content = response["choices"][0]["message"]["content"]
             # Parse the JSON content
-            parsed = json.loads(content)
+            parsed = orjson.loads(content)
 
             # Validate required fields
             if "score" in parsed and "persona" in parsed and "reasoning" in parsed:
@@ -139,7 +263,7 @@ class OpenAIScoringClient:
                     "persona": parsed["persona"],
                     "reasoning": parsed["reasoning"],
                 }
-        except (KeyError, IndexError, TypeError, json.JSONDecodeError, ValueError):
+        except (KeyError, IndexError, TypeError, ValueError):  # orjson.JSONDecodeError is a ValueError
             return None
         return None
 
@@ -155,8 +279,6 @@ class OpenAIScoringClient:
 
     def _mock_score_lead(self, lead_payload: Dict[str, Any]) -> Dict[str, Any]:
         """Deterministic mock used when OpenAI is unavailable"""
-        import random
-
         company_size = lead_payload.get("employee_count", 0)
         revenue = lead_payload.get("revenue", 0)
 
@@ -174,7 +296,8 @@ class OpenAIScoringClient:
             base += 0.1
 
         persona = "enterprise" if company_size >= 500 else "smb"
-        score = min(0.95, max(0.2, base + random.uniform(-0.05, 0.05)))
+        # Jitter seeded per company: same lead -> same score, no shared global RNG state
+        score = min(0.95, max(0.2, base + _mock_jitter(str(lead_payload.get("company_name", "")))))
 
         return {
             "score": round(score, 3),
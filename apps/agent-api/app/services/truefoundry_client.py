@@ -3,9 +3,11 @@ Truefoundry API client for deploying and running AI agents
 Handles personalized message generation via Truefoundry-hosted micro-agents
 """
 import os
+import re
 import logging
 import httpx
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 try:
     from app.config.settings import settings as app_settings
@@ -14,6 +16,32 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+@lru_cache(maxsize=128)
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """Split a {{variable}} template into alternating literal/name parts (parsed once per body)"""
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def _render_template(template: str, values: Dict[str, Any]) -> str:
+    """
+    Render a {{variable}} template
+
+    Args:
+        template: Template text with {{variable}} placeholders
+        values: Substitution values; unknown placeholders are left as-is
+
+    Returns:
+        Rendered text
+    """
+    parts = list(_compile_template(template))
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = str(values[name]) if name in values else f"{{{{{name}}}}}"
+    return "".join(parts)
+
 
 class TruefoundryClient:
     """Client for Truefoundry AI agent platform"""
@@ -97,10 +125,7 @@ class TruefoundryClient:
 
     def _mock_generate_message(self, template: str, lead_data: Dict[str, Any]) -> Dict[str, str]:
         """Mock message generation for testing/demo"""
-        # Simple variable replacement
-        body = template
-        for key, value in lead_data.items():
-            body = body.replace(f"{{{{{key}}}}}", str(value))
+        body = _render_template(template, lead_data)
 
         # Extract subject if template has it
         subject = lead_data.get("company_name", "Your Company") + " x Pipeline Whisperer"
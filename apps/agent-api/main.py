@@ -2,6 +2,7 @@
 Pipeline Whisperer Agent API
 Main FastAPI application with Sentry instrumentation
 """
+import logging
 import os
 from contextlib import asynccontextmanager
 
@@ -10,40 +11,60 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import func
 
+from app.config.settings import settings
+from app.middleware import PROBE_PATH_PREFIXES, ProbeAwareGZipMiddleware
+from app.responses import OrjsonResponse
 from app.routes import leads_router
 from app.routes.experiments import router as experiments_router
 from app.routes.dashboard import router as dashboard_router
-from app.models.base import SessionLocal
+from app.models.base import SessionLocal, engine
 from app.models.lead import Lead
 
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def traces_sampler(sampling_context: dict) -> float:
+    """Drop transactions for probe endpoints, sample everything else at the configured rate"""
+    path = (sampling_context.get("asgi_scope") or {}).get("path", "")
+    # Probes are hit every few seconds; tracing them only adds per-request overhead
+    if path.startswith(PROBE_PATH_PREFIXES):
+        return 0.0
+    return settings.sentry_traces_sample_rate
+
+
 # Initialize Sentry (only if DSN is configured and valid)
-sentry_dsn = os.getenv("SENTRY_DSN_PYTHON")
+sentry_dsn = settings.sentry_dsn_python
 if sentry_dsn and not sentry_dsn.startswith("https://your_"):
     sentry_sdk.init(
         dsn=sentry_dsn,
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
-        environment=os.getenv("SENTRY_ENVIRONMENT", "development"),
+        traces_sampler=traces_sampler,
+        profiles_sample_rate=settings.sentry_profiles_sample_rate,
+        environment=settings.sentry_environment,
     )
-    print("✅ Sentry monitoring enabled")
+    logger.info("Sentry monitoring enabled")
 else:
-    print("ℹ️  Sentry monitoring disabled (DSN not configured)")
+    logger.info("Sentry monitoring disabled (DSN not configured)")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
-    print("🚀 Pipeline Whisperer Agent API starting...")
+    logger.info("Pipeline Whisperer Agent API starting...")
 
     # TODO: Initialize Kafka consumers
     # TODO: Initialize database connections
 
     yield
 
-    # Shutdown
-    print("👋 Pipeline Whisperer Agent API shutting down...")
-    # TODO: Cleanup resources
+    # Shutdown - uvicorn owns SIGINT/SIGTERM and runs this block once in-flight
+    # requests have drained, so no custom signal handlers are installed here
+    logger.info("Pipeline Whisperer Agent API shutting down...")
+    engine.dispose()
 
 
 app = FastAPI(
@@ -51,12 +72,22 @@ app = FastAPI(
     description="Autonomous GTM agent powered by Lightfield, OpenAI, Redpanda, Truefoundry, and Sentry",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=OrjsonResponse,
+)
+
+# Allowed origins are parsed once at import; a frozenset keeps the per-request
+# origin check in CORSMiddleware a hash lookup instead of a list scan
+CORS_ORIGINS: frozenset[str] = frozenset(
+    origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()
 )
 
+# Compress list/dashboard responses; probe endpoints are served uncompressed
+app.add_middleware(ProbeAwareGZipMiddleware, minimum_size=2048)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Next.js frontend
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -0,0 +1,33 @@
+"""Shared test setup for the agent API and workers"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# The engine is created at import time - point it at a throwaway SQLite file first
+_DB_DIR = tempfile.mkdtemp(prefix="pipeline-whisperer-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_DB_DIR, 'test.db').as_posix()}"
+
+# Workers are imported as services.workers.* from the repository root
+APP_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = APP_ROOT.parents[1]
+for path in (APP_ROOT, REPO_ROOT):
+    path_str = str(path)
+    if path_str not in sys.path:
+        sys.path.insert(0, path_str)
+
+import pytest
+
+from app.models.base import Base, SessionLocal, engine
+
+
+@pytest.fixture
+def db():
+    """Fresh schema and a session per test"""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
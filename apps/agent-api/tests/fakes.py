@@ -0,0 +1,111 @@
+"""In-memory stand-ins for confluent_kafka consumers and the Kafka producer service"""
+from typing import Callable, List, Optional
+
+from confluent_kafka import TopicPartition
+
+
+class FakeMessage:
+    """confluent_kafka.Message with just the accessors the workers use"""
+
+    def __init__(self, value: bytes, topic: str, offset: int, partition: int = 0, key: Optional[bytes] = None):
+        self._value = value
+        self._topic = topic
+        self._offset = offset
+        self._partition = partition
+        self._key = key
+
+    def error(self):
+        return None
+
+    def value(self):
+        return self._value
+
+    def key(self):
+        return self._key
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+
+class FakeConsumer:
+    """
+    Serves queued batches from consume(), then calls on_drained (e.g. to request shutdown)
+
+    Tracks its position like librdkafka: one past the last consumed offset per
+    partition, moved back by seek().
+    """
+
+    def __init__(self, batches: List[List[FakeMessage]], on_drained: Callable[[], None] = lambda: None):
+        self.batches = list(batches)
+        self.on_drained = on_drained
+        self.positions = {}
+        self.commits = []
+        self.seeks = []
+        self.paused = set()
+        self.closed = False
+
+    def subscribe(self, topics, **kwargs):
+        pass
+
+    def consume(self, num_messages=1, timeout=-1):
+        if not self.batches:
+            self.on_drained()
+            return []
+        batch = self.batches.pop(0)
+        for msg in batch:
+            self.positions[(msg.topic(), msg.partition())] = msg.offset() + 1
+        return batch
+
+    def assignment(self):
+        return [TopicPartition(topic, partition) for topic, partition in self.positions]
+
+    def position(self, partitions):
+        return [
+            TopicPartition(tp.topic, tp.partition, self.positions.get((tp.topic, tp.partition), -1001))
+            for tp in partitions
+        ]
+
+    def seek(self, partition):
+        self.seeks.append(partition)
+        self.positions[(partition.topic, partition.partition)] = partition.offset
+
+    def pause(self, partitions):
+        self.paused.update((tp.topic, tp.partition) for tp in partitions)
+
+    def resume(self, partitions):
+        self.paused.difference_update((tp.topic, tp.partition) for tp in partitions)
+
+    def commit(self, *args, **kwargs):
+        self.commits.append(kwargs)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeProducer:
+    """KafkaProducerService double; flush() reports the next queued undelivered count"""
+
+    def __init__(self):
+        self.scored = []
+        self.dead_letters = []
+        self.flush_results: List[int] = []
+
+    def publish_scored_lead(self, event):
+        self.scored.append(event)
+        return True
+
+    def publish_dead_letter(self, value, key, error, topic=None):
+        self.dead_letters.append({"value": value, "key": key, "error": error, "topic": topic})
+        return True
+
+    def flush(self, timeout=10.0):
+        return self.flush_results.pop(0) if self.flush_results else 0
+
+    def close(self):
+        pass
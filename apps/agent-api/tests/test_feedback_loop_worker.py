@@ -0,0 +1,165 @@
+"""Feedback loop worker: failed events are dead-lettered before offsets move"""
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.workers.feedback_loop_worker as worker_module
+from app.config.settings import settings
+from app.models.experiment import Experiment
+from app.models.lead import Lead
+
+from fakes import FakeConsumer, FakeMessage, FakeProducer
+
+TOPIC = "outreach.events"
+
+
+@pytest.fixture
+def producer(monkeypatch):
+    producer = FakeProducer()
+    monkeypatch.setattr(worker_module, "get_kafka_producer", lambda: producer)
+    monkeypatch.setattr(worker_module, "DB_RETRY_BACKOFF_SECONDS", 0)
+    return producer
+
+
+def run_worker(monkeypatch, batch):
+    """Run main() over a single batch, stopping once the consumer is drained"""
+    monkeypatch.setattr(worker_module, "shutdown_flag", False)
+    consumer = FakeConsumer([batch], on_drained=lambda: setattr(worker_module, "shutdown_flag", True))
+    monkeypatch.setattr(worker_module, "Consumer", lambda config: consumer)
+    worker_module.main()
+    return consumer
+
+
+def committed(consumer, asynchronous):
+    """Offsets passed to each commit of the given kind"""
+    return [
+        [(tp.topic, tp.partition, tp.offset) for tp in call["offsets"]]
+        for call in consumer.commits
+        if call["asynchronous"] is asynchronous
+    ]
+
+
+def event_message(offset, **event):
+    return FakeMessage(json.dumps(event).encode("utf-8"), TOPIC, offset)
+
+
+@pytest.fixture
+def lead_id(db):
+    """A contacted lead in experiment exp_a"""
+    lead = Lead(lightfield_id="lf_1", company_name="Acme")
+    experiment = Experiment(
+        experiment_id="exp_a", name="A", leads_assigned=1, outreach_sent=1,
+        conversions=0, responses_received=0, alpha=1.0, beta=1.0,
+    )
+    db.add_all([lead, experiment])
+    db.commit()
+    return lead.id
+
+
+def test_failed_events_are_dead_lettered_then_committed(monkeypatch, db, producer):
+    batch = [
+        event_message(10, event_type="outreach.opened", lead_id=99, experiment_id="exp_missing"),
+        FakeMessage(b"{not json", TOPIC, 11),
+    ]
+
+    consumer = run_worker(monkeypatch, batch)
+
+    assert sorted(d["value"] for d in producer.dead_letters) == sorted(msg.value() for msg in batch)
+    assert {d["topic"] for d in producer.dead_letters} == {settings.kafka_topic_outreach_events_dlq}
+    assert consumer.seeks == []
+    assert committed(consumer, asynchronous=True) == [[(TOPIC, 0, 12)]]
+
+
+def test_mixed_batch_retries_dead_letters_in_place(monkeypatch, db, producer, lead_id):
+    batch = [
+        event_message(20, event_type="outreach.converted", lead_id=lead_id, experiment_id="exp_a"),
+        event_message(21, event_type="outreach.opened", lead_id=99, experiment_id="exp_a"),
+    ]
+    # First DLQ flush times out, the retry delivers
+    producer.flush_results = [1, 0]
+
+    consumer = run_worker(monkeypatch, batch)
+
+    # The conversion was committed once and never replayed
+    db.expire_all()
+    exp = db.query(Experiment).filter_by(experiment_id="exp_a").one()
+    assert exp.conversions == 1
+    assert exp.alpha == 2.0
+    assert consumer.seeks == []
+    assert committed(consumer, asynchronous=True) == [[(TOPIC, 0, 22)]]
+    assert {d["value"] for d in producer.dead_letters} == {batch[1].value()}
+
+
+def test_mixed_batch_is_not_committed_on_shutdown_before_dead_letters_land(monkeypatch, db, producer, lead_id):
+    batch = [
+        event_message(20, event_type="outreach.converted", lead_id=lead_id, experiment_id="exp_a"),
+        event_message(21, event_type="outreach.opened", lead_id=99, experiment_id="exp_a"),
+    ]
+    # The DLQ stays unreachable until shutdown is requested
+    producer.flush_results = [1, 1]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        worker_module.shutdown_flag = True
+
+    monkeypatch.setattr(worker_module.time, "sleep", sleep)
+
+    consumer = run_worker(monkeypatch, batch)
+
+    assert sleeps == [0]
+    assert consumer.seeks == []
+    assert consumer.commits == []
+
+
+def test_batch_is_rewound_when_db_is_unreachable(monkeypatch, db, producer):
+    # Nothing can be applied or dead-lettered while the database is down
+    unreachable = create_engine("sqlite:////nonexistent-dir/outage.db")
+    monkeypatch.setattr(worker_module, "SessionLocal", sessionmaker(bind=unreachable))
+    batch = [
+        event_message(30, event_type="outreach.converted", lead_id=1, experiment_id="exp_a"),
+        event_message(31, event_type="outreach.opened", lead_id=1, experiment_id="exp_a"),
+    ]
+
+    consumer = run_worker(monkeypatch, batch)
+
+    assert [(tp.topic, tp.partition, tp.offset) for tp in consumer.seeks] == [(TOPIC, 0, 30)]
+    assert consumer.commits == []
+    assert producer.dead_letters == []
+
+
+def test_shutdown_recommits_only_the_last_committed_offsets(monkeypatch, db, producer, lead_id):
+    committed_batch = [event_message(50, event_type="outreach.converted", lead_id=lead_id, experiment_id="exp_a")]
+    # Consumed but interrupted before its dead letter landed
+    interrupted_batch = [
+        event_message(51, event_type="outreach.converted", lead_id=lead_id, experiment_id="exp_a"),
+        event_message(52, event_type="outreach.opened", lead_id=99, experiment_id="exp_a"),
+    ]
+    producer.flush_results = [1, 1]
+    monkeypatch.setattr(worker_module.time, "sleep", lambda seconds: setattr(worker_module, "shutdown_flag", True))
+    monkeypatch.setattr(worker_module, "shutdown_flag", False)
+    consumer = FakeConsumer([committed_batch, interrupted_batch])
+    monkeypatch.setattr(worker_module, "Consumer", lambda config: consumer)
+
+    worker_module.main()
+
+    assert committed(consumer, asynchronous=True) == [[(TOPIC, 0, 51)]]
+    # The shutdown commit repeats the last async commit, not the consumer's position (53)
+    assert committed(consumer, asynchronous=False) == [[(TOPIC, 0, 51)]]
+    assert consumer.closed
+
+
+def test_shutdown_commits_nothing_before_the_first_batch_commit(monkeypatch, db, producer):
+    consumer = run_worker(monkeypatch, [])
+
+    assert consumer.commits == []
+
+
+def test_dead_letter_events_reports_undelivered_messages(db, producer):
+    producer.flush_results = [2]
+    failed = [FakeMessage(b"{}", TOPIC, 40), FakeMessage(b"{}", TOPIC, 41)]
+
+    assert worker_module.dead_letter_events(failed, db, producer) is False
+    assert len(producer.dead_letters) == 2
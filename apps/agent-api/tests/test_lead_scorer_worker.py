@@ -0,0 +1,394 @@
+"""Lead scorer worker: batch inserts, DLQ routing, Batch API buffering and the keep-alive loop"""
+import threading
+
+import orjson
+import pytest
+from confluent_kafka import TopicPartition
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.workers.lead_scorer_worker as worker_module
+from app.config.settings import settings
+from app.models.lead import Lead
+from services.simulators.lightfield_simulator import LightfieldSimulator
+
+from fakes import FakeConsumer, FakeMessage, FakeProducer
+
+TOPIC = settings.kafka_topic_leads_raw
+
+
+@pytest.fixture
+def producer():
+    return FakeProducer()
+
+
+class NoWaitEvent(threading.Event):
+    """Shutdown event whose retry backoff returns immediately"""
+
+    def wait(self, timeout=None):
+        return self.is_set()
+
+
+@pytest.fixture
+def shutdown_event(monkeypatch):
+    event = NoWaitEvent()
+    monkeypatch.setattr(worker_module, "shutdown_event", event)
+    return event
+
+
+@pytest.fixture
+def make_worker(monkeypatch, db, producer, shutdown_event):
+    """Build a worker on fake Kafka clients with mock (no API key) scoring; shuts down once drained"""
+    monkeypatch.setattr(settings, "openai_api_key", None)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(worker_module, "get_kafka_producer", lambda: producer)
+    workers = []
+
+    def factory(worker_class=worker_module.BatchLeadScorerWorker, batches=()):
+        consumer = FakeConsumer(list(batches), on_drained=shutdown_event.set)
+        monkeypatch.setattr(worker_module, "Consumer", lambda config: consumer)
+        worker = worker_class()
+        workers.append(worker)
+        return worker
+
+    yield factory
+    for worker in workers:
+        worker.loop.close()
+        worker.db.close()
+
+
+@pytest.fixture
+def leads():
+    return LightfieldSimulator(seed=1).generate_batch(5)
+
+
+@pytest.fixture
+def leads_with_poison_row(leads):
+    """The third lead can never be inserted (company name is NOT NULL)"""
+    leads[2]["company"]["name"] = None
+    return leads
+
+
+def raw_batch(leads, first_offset=0):
+    return [FakeMessage(orjson.dumps(lead), TOPIC, offset) for offset, lead in enumerate(leads, first_offset)]
+
+
+def test_poison_row_is_dead_lettered_and_good_rows_persist(make_worker, leads_with_poison_row, db, producer):
+    worker = make_worker(worker_module.LeadScorerWorker, batches=[raw_batch(leads_with_poison_row)])
+
+    worker.run()
+
+    poison_id = leads_with_poison_row[2]["lightfield_id"]
+    persisted = {lead.lightfield_id for lead in db.query(Lead).all()}
+    assert persisted == {lead["lightfield_id"] for lead in leads_with_poison_row} - {poison_id}
+    assert {event["lightfield_id"] for event in producer.scored} == persisted
+
+    (dead_letter,) = producer.dead_letters
+    assert dead_letter["key"] == poison_id.encode("utf-8")
+    assert dead_letter["error"].startswith("insert error:")
+    # Every lead is accounted for, so the batch's offsets move past the poison row; shutdown re-commits them
+    assert [(call["asynchronous"], [tp.offset for tp in call["offsets"]]) for call in worker.consumer.commits] == [
+        (True, [5]),
+        (False, [5]),
+    ]
+    assert worker.consumer.seeks == []
+
+
+def unreachable_session():
+    return sessionmaker(bind=create_engine("sqlite:////nonexistent-dir/outage.db"))()
+
+
+def test_batch_is_rewound_when_db_is_unreachable(make_worker, leads, producer):
+    worker = make_worker(worker_module.LeadScorerWorker)
+    msgs = raw_batch(leads, first_offset=40)
+    worker.db = unreachable_session()
+
+    assert worker.process_with_retry(leads, msgs) is False
+
+    # Nothing is dead-lettered during an outage, and the batch will be consumed again
+    assert producer.dead_letters == []
+    assert [(tp.topic, tp.partition, tp.offset) for tp in worker.consumer.seeks] == [(TOPIC, 0, 40)]
+
+
+def test_failed_batch_jobs_count_toward_flush_attempts(monkeypatch, make_worker, leads, db):
+    monkeypatch.setattr(settings, "openai_batch_max_leads", len(leads))
+    worker = make_worker()
+    submissions = []
+
+    def failed_batch(scoring_inputs):
+        submissions.append(scoring_inputs)
+        raise RuntimeError("OpenAI batch batch_1 ended with status failed")
+
+    monkeypatch.setattr(worker, "_run_openai_batch", failed_batch)
+
+    assert worker.process_batch(leads) is False
+    for _ in range(worker_module.MAX_FLUSH_ATTEMPTS - 1):
+        assert worker.flush_buffer() is False
+    assert db.query(Lead).count() == 0
+
+    # Out of attempts - the buffer is mock-scored instead of resubmitted
+    assert worker.flush_buffer() is True
+    assert len(submissions) == worker_module.MAX_FLUSH_ATTEMPTS
+    assert db.query(Lead).count() == len(leads)
+    assert worker.buffer == [] and worker.flush_attempts == 0
+
+
+def test_failed_persist_keeps_only_unpersisted_leads(monkeypatch, make_worker, leads_with_poison_row, db, producer):
+    monkeypatch.setattr(settings, "openai_batch_max_leads", len(leads_with_poison_row))
+    worker = make_worker()
+    submissions = []
+    monkeypatch.setattr(worker, "_run_openai_batch", lambda scoring_inputs: submissions.append(scoring_inputs) or {})
+
+    assert worker.process_batch(leads_with_poison_row) is False
+
+    poison_id = leads_with_poison_row[2]["lightfield_id"]
+    assert [lead["lightfield_id"] for lead in worker.buffer] == [poison_id]
+    assert worker.buffer_ids == {poison_id}
+    assert worker.flush_attempts == 1
+    assert db.query(Lead).count() == 4
+    assert len(producer.scored) == 4
+
+    # Retrying the persist doesn't resubmit the lead to the Batch API
+    assert worker.flush_buffer() is False
+    assert len(submissions) == 1
+
+
+def test_unflushed_buffer_is_not_committed(monkeypatch, make_worker, leads_with_poison_row, db):
+    monkeypatch.setattr(settings, "openai_batch_max_leads", len(leads_with_poison_row))
+    worker = make_worker(batches=[raw_batch(leads_with_poison_row)])
+
+    worker.run()
+
+    assert db.query(Lead).count() == 4
+    assert worker.consumer.commits == []
+
+
+class FakeBatchClient:
+    """Batch API double: the job is in progress for one poll, then completes"""
+
+    mock_mode = False
+
+    def __init__(self, consumer):
+        self.consumer = consumer
+        self.statuses = ["in_progress", "completed"]
+        self.paused_at_poll = []
+
+    def build_batch_line(self, lightfield_id, scoring_input):
+        return {"custom_id": lightfield_id}
+
+    def submit_batch(self, lines):
+        return "batch_1"
+
+    def get_batch(self, batch_id):
+        self.paused_at_poll.append(set(self.consumer.paused))
+        return {"status": self.statuses.pop(0), "output_file_id": "file_1"}
+
+    def fetch_batch_results(self, output_file_id):
+        return {"lf_1": {"score": 0.9}}
+
+
+def test_keep_alive_hands_back_messages_and_pauses_new_partitions(monkeypatch, make_worker):
+    monkeypatch.setattr(settings, "openai_batch_poll_seconds", 0.05)
+    monkeypatch.setattr(settings, "kafka_poll_timeout_ms", 0)
+    # Partition 0 is assigned up front; a rebalance adds partition 1 mid-job
+    rebalanced = [FakeMessage(b"{}", TOPIC, 7, partition=1)]
+    worker = make_worker(batches=[rebalanced])
+    worker.consumer.positions[(TOPIC, 0)] = 3
+    client = FakeBatchClient(worker.consumer)
+    worker.scoring_client = client
+
+    results = worker._run_openai_batch({"lf_1": {}})
+
+    assert results == {"lf_1": {"score": 0.9}}
+    assert [(tp.topic, tp.partition, tp.offset) for tp in worker.consumer.seeks] == [(TOPIC, 1, 7)]
+    assert client.paused_at_poll == [{(TOPIC, 0)}, {(TOPIC, 0), (TOPIC, 1)}]
+    # Resumed against the current assignment, not the one at submission
+    assert worker.consumer.paused == set()
+    assert TopicPartition(TOPIC, 1) in worker.consumer.assignment()
+
+
+def test_identical_companies_are_scored_once(monkeypatch, make_worker, leads, db):
+    worker = make_worker(worker_module.LeadScorerWorker)
+    calls = []
+
+    async def score_lead_async(scoring_input):
+        calls.append(scoring_input)
+        return {"score": 0.8, "persona": "enterprise", "mock": False}
+
+    monkeypatch.setattr(worker.scoring_client, "score_lead_async", score_lead_async)
+    # Same company under another lead id, with different case and padding
+    twin = {
+        **leads[0],
+        "lightfield_id": "lf_twin",
+        "company": {**leads[0]["company"], "name": f"  {leads[0]['company']['name'].upper()} "},
+    }
+
+    assert worker.process_batch([leads[0]]) is True
+    assert worker.process_batch([twin]) is True
+    assert len(calls) == 1
+    assert db.query(Lead).count() == 2
+
+
+def test_mock_fallbacks_are_not_cached(make_worker, leads, db):
+    worker = make_worker(worker_module.LeadScorerWorker)
+
+    assert worker.process_batch(leads[:2]) is True
+    assert worker.scoring_cache == {}
+
+
+def test_cached_scores_expire_after_ttl(monkeypatch, make_worker):
+    worker = make_worker(worker_module.LeadScorerWorker)
+    now = [1000.0]
+    monkeypatch.setattr(worker_module.time, "monotonic", lambda: now[0])
+
+    worker._cache_score("key", {"score": 0.8})
+    now[0] += worker_module.SCORING_CACHE_TTL_SECONDS - 1
+    assert worker._get_cached_score("key") == {"score": 0.8}
+
+    now[0] += 2
+    assert worker._get_cached_score("key") is None
+    assert "key" not in worker.scoring_cache
+
+
+def test_scoring_cache_evicts_least_recently_used(monkeypatch, make_worker):
+    monkeypatch.setattr(worker_module, "SCORING_CACHE_MAX_ENTRIES", 2)
+    worker = make_worker(worker_module.LeadScorerWorker)
+
+    worker._cache_score("a", {"score": 0.1})
+    worker._cache_score("b", {"score": 0.2})
+    # Reading "a" makes "b" the least recently used
+    worker._get_cached_score("a")
+    worker._cache_score("c", {"score": 0.3})
+
+    assert list(worker.scoring_cache) == ["a", "c"]
+
+
+class FakeCopy:
+    """psycopg Copy/Cursor/Connection stand-in recording COPY statements and rows"""
+
+    def __init__(self):
+        self.statements = []
+        self.rows = []
+
+    def cursor(self):
+        return self
+
+    def copy(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def scored_batch(worker, leads):
+    now = worker_module.datetime.now(worker_module.timezone.utc)
+    scored_at = now.isoformat(timespec='milliseconds')
+    return [
+        (lead, worker._build_scoring_result(worker._scoring_input_for(lead), {"score": 0.7, "persona": "enterprise"}, scored_at))
+        for lead in leads
+    ], now
+
+
+def pretend_postgresql(monkeypatch, worker):
+    """Report a PostgreSQL bind to the COPY gate while statements still run on SQLite"""
+    postgresql = type("Bind", (), {"dialect": type("Dialect", (), {"name": "postgresql"})})
+    get_bind = worker.db.get_bind
+    monkeypatch.setattr(
+        worker.db, "get_bind",
+        lambda *args, **kwargs: get_bind(*args, **kwargs) if args or kwargs else postgresql,
+    )
+
+
+def test_copy_fast_path_is_postgresql_only(monkeypatch, make_worker, leads, db):
+    monkeypatch.setattr(settings, "enable_copy_fast_path", True)
+    monkeypatch.setattr(worker_module, "COPY_THRESHOLD", 2)
+    worker = make_worker(worker_module.LeadScorerWorker)
+    monkeypatch.setattr(worker, "_copy_leads", lambda rows: pytest.fail("COPY used on SQLite"))
+    scored, now = scored_batch(worker, leads)
+
+    assert worker.persist_scored_leads(scored, now) is True
+    assert db.query(Lead).count() == len(leads)
+
+
+def test_copy_fast_path_used_for_large_postgresql_batches(monkeypatch, make_worker, leads, producer):
+    monkeypatch.setattr(settings, "enable_copy_fast_path", True)
+    monkeypatch.setattr(worker_module, "COPY_THRESHOLD", len(leads))
+    worker = make_worker(worker_module.LeadScorerWorker)
+    pretend_postgresql(monkeypatch, worker)
+    copied = []
+    monkeypatch.setattr(
+        worker, "_copy_leads",
+        lambda rows: copied.extend(rows) or [(i, row["lightfield_id"]) for i, row in enumerate(rows, 1)],
+    )
+    scored, now = scored_batch(worker, leads)
+
+    assert worker.persist_scored_leads(scored, now) is True
+    assert [row["lightfield_id"] for row in copied] == [lead["lightfield_id"] for lead in leads]
+    assert [event["db_id"] for event in producer.scored] == list(range(1, len(leads) + 1))
+
+
+
+def test_small_postgresql_batches_use_insert(monkeypatch, make_worker, leads, db):
+    monkeypatch.setattr(settings, "enable_copy_fast_path", True)
+    monkeypatch.setattr(worker_module, "COPY_THRESHOLD", len(leads) + 1)
+    worker = make_worker(worker_module.LeadScorerWorker)
+    pretend_postgresql(monkeypatch, worker)
+    monkeypatch.setattr(worker, "_copy_leads", lambda rows: pytest.fail("COPY used below the threshold"))
+    scored, now = scored_batch(worker, leads)
+
+    assert worker.persist_scored_leads(scored, now) is True
+    assert db.query(Lead).count() == len(leads)
+
+def test_copy_leads_writes_rows_in_column_order(monkeypatch, make_worker, leads):
+    worker = make_worker(worker_module.LeadScorerWorker)
+    fake_copy = FakeCopy()
+    raw_connection = type("Connection", (), {"driver_connection": fake_copy})
+    monkeypatch.setattr(worker.db, "connection", lambda: type("Conn", (), {"connection": raw_connection}))
+    scored, now = scored_batch(worker, leads[:1])
+    row = worker.build_lead_row(*scored[0], now)
+
+    worker._copy_leads([row])
+
+    assert fake_copy.statements == [worker_module.COPY_LEADS_SQL]
+    (written,) = fake_copy.rows
+    assert written[0] == leads[0]["lightfield_id"]
+    assert isinstance(written[8], worker_module.Json) and written[8].obj == leads[0]
+    # Enum columns are written as member names, counters as explicit zeros
+    assert (written[10], written[12]) == (row["persona"].name, "SCORED")
+    assert written[13] == now
+    assert written[-2:] == (0, 0)
+
+
+def test_flush_dead_letters_buffer_after_max_attempts(monkeypatch, make_worker, leads_with_poison_row, db, producer):
+    monkeypatch.setattr(settings, "openai_batch_max_leads", len(leads_with_poison_row))
+    worker = make_worker()
+    monkeypatch.setattr(worker, "_run_openai_batch", lambda scoring_inputs: {})
+
+    assert worker.process_with_retry(leads_with_poison_row, raw_batch(leads_with_poison_row)) is False
+    for _ in range(worker_module.MAX_FLUSH_ATTEMPTS - 2):
+        assert worker.flush_buffer() is False
+    assert producer.dead_letters == []
+    assert worker.flush_buffer() is True
+
+    assert worker.buffer == [] and worker.flush_attempts == 0
+    (dead_letter,) = producer.dead_letters
+    assert dead_letter["key"] == leads_with_poison_row[2]["lightfield_id"].encode("utf-8")
+    assert dead_letter["error"].startswith("insert error:")
+    assert db.query(Lead).count() == 4
+
+
+def test_batch_worker_rewinds_leads_it_could_not_buffer(make_worker, leads):
+    worker = make_worker()
+    worker.db = unreachable_session()
+
+    assert worker.process_with_retry(leads, raw_batch(leads, first_offset=7)) is False
+
+    assert worker.buffer == []
+    assert [(tp.topic, tp.partition, tp.offset) for tp in worker.consumer.seeks] == [(TOPIC, 0, 7)]
@@ -0,0 +1,36 @@
+"""API entrypoint: Sentry sampling and default response class"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.config.settings import settings
+
+
+@pytest.fixture
+def sample_rate(monkeypatch):
+    monkeypatch.setattr(settings, "sentry_traces_sample_rate", 0.25)
+    return 0.25
+
+
+@pytest.mark.parametrize("path", ["/health", "/health/detailed", "/metrics"])
+def test_traces_sampler_drops_probe_endpoints(sample_rate, path):
+    assert main.traces_sampler({"asgi_scope": {"path": path}}) == 0.0
+
+
+@pytest.mark.parametrize("path", ["/", "/leads/", "/dashboard/metrics"])
+def test_traces_sampler_uses_configured_rate(sample_rate, path):
+    assert main.traces_sampler({"asgi_scope": {"path": path}}) == sample_rate
+
+
+def test_traces_sampler_without_asgi_scope(sample_rate):
+    # Non-HTTP transactions (background tasks, CLI) carry no asgi_scope
+    assert main.traces_sampler({}) == sample_rate
+    assert main.traces_sampler({"asgi_scope": None}) == sample_rate
+
+
+def test_routes_render_with_orjson():
+    response = TestClient(main.app).get("/")
+
+    assert response.headers["content-type"] == "application/json"
+    # Compact separators - the stdlib encoder would emit ", " and ": "
+    assert response.content == b'{"name":"Pipeline Whisperer Agent API","version":"0.1.0","status":"running"}'
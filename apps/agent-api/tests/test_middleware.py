@@ -0,0 +1,59 @@
+"""Probe-aware GZip middleware"""
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import ProbeAwareGZipMiddleware
+
+LARGE_BODY = "x" * 4096
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(ProbeAwareGZipMiddleware)
+
+    @app.get("/health", response_class=PlainTextResponse)
+    def health():
+        return LARGE_BODY
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        return LARGE_BODY
+
+    @app.get("/leads/", response_class=PlainTextResponse)
+    def leads():
+        return LARGE_BODY
+
+    @app.get("/leads/small", response_class=PlainTextResponse)
+    def small():
+        return "x" * 1024
+
+    return TestClient(app, headers={"Accept-Encoding": "gzip"})
+
+
+@pytest.mark.parametrize("path", ["/health", "/metrics"])
+def test_probe_endpoints_are_not_compressed(client, path):
+    response = client.get(path)
+
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE_BODY
+
+
+def test_large_responses_are_compressed(client):
+    response = client.get("/leads/")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+
+
+def test_responses_below_minimum_size_are_not_compressed(client):
+    # Default minimum_size is 2048 bytes
+    assert "content-encoding" not in client.get("/leads/small").headers
+
+
+def test_uses_fast_compression_level():
+    middleware = ProbeAwareGZipMiddleware(FastAPI())
+    assert middleware.compresslevel == 1
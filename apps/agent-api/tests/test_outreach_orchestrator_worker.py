@@ -0,0 +1,216 @@
+"""Outreach orchestrator: reference data caches, event-only skip checks, experiment counters and event produce"""
+import orjson
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.workers.outreach_orchestrator_worker as worker_module
+from app.models.experiment import Experiment
+from app.models.base import SessionLocal
+from app.models.lead import Lead, LeadStatus
+from app.models.outreach_template import OutreachTemplate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(worker_module.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    monkeypatch.setattr(worker_module, "_experiment_cache", {"expires_at": 0.0, "arms": []})
+    monkeypatch.setattr(worker_module, "_template_cache", {})
+
+
+@pytest.fixture
+def experiment(db):
+    experiment = Experiment(experiment_id="exp_a", name="Experiment A", alpha=1.0, beta=1.0, is_active=True)
+    db.add(experiment)
+    db.add(OutreachTemplate(
+        template_id="tmpl_a",
+        name="Template A",
+        experiment_id="exp_a",
+        body_template="Hi {{contact_name}}",
+        is_active=True,
+    ))
+    db.commit()
+    return experiment
+
+
+def deactivate(db, model, **filters):
+    db.query(model).filter_by(**filters).update({"is_active": False})
+    db.commit()
+
+
+def test_experiment_cache_expires_after_ttl(db, clock, experiment):
+    lead = Lead()
+    assert worker_module.select_experiment(db, lead).experiment_id == "exp_a"
+
+    deactivate(db, Experiment, experiment_id="exp_a")
+
+    # Still within the TTL - the cached arms are used
+    clock.now += worker_module.REFERENCE_CACHE_TTL_SECONDS - 1
+    assert worker_module.select_experiment(db, lead).experiment_id == "exp_a"
+
+    # Past the TTL - active experiments are re-queried
+    clock.now += 1
+    assert worker_module.select_experiment(db, lead) is None
+
+
+def test_template_cache_expires_after_ttl(db, clock, experiment):
+    assert worker_module.get_template_for_experiment(db, experiment).template_id == "tmpl_a"
+
+    deactivate(db, OutreachTemplate, template_id="tmpl_a")
+
+    clock.now += worker_module.REFERENCE_CACHE_TTL_SECONDS - 1
+    assert worker_module.get_template_for_experiment(db, experiment).template_id == "tmpl_a"
+
+    clock.now += 1
+    assert worker_module.get_template_for_experiment(db, experiment) is None
+
+
+def test_cached_template_outlives_its_session(db, clock, experiment):
+    assert worker_module.get_template_for_experiment(db, experiment).template_id == "tmpl_a"
+    db.close()
+
+    # Served from the cache in a later batch, after the loading session is gone
+    template = worker_module.get_template_for_experiment(db, experiment)
+    assert template.body_template == "Hi {{contact_name}}"
+
+
+@pytest.mark.parametrize("scoring, reason", [
+    ({"score": 0.2}, "score too low (0.2)"),
+    ({"score": worker_module.MIN_OUTREACH_SCORE}, None),
+    ({"score": 0.9}, None),
+    ({"score": None}, None),
+    ({}, None),
+    (None, None),
+])
+def test_event_skip_reason(scoring, reason):
+    event = {"lightfield_id": "lf_1", "scoring": scoring}
+
+    assert worker_module.event_skip_reason(event) == reason
+
+
+def test_event_without_scoring_payload_must_be_loaded():
+    # Older producers sent no scoring payload - only the DB row can decide
+    assert worker_module.event_skip_reason({"lightfield_id": "lf_1"}) is None
+
+
+def test_low_score_event_is_skipped_without_a_db_query():
+    unreachable = sessionmaker(bind=create_engine("sqlite:////nonexistent-dir/outage.db"))()
+    event = {"lightfield_id": "lf_1", "scoring": {"score": 0.1}}
+
+    assert worker_module.process_scored_lead(event, unreachable) is True
+
+
+class FakeMessaging:
+    """Stands in for the Truefoundry and Lightfield clients"""
+
+    def generate_personalized_message(self, **kwargs):
+        return {"subject": "Hello", "body": "Hi there"}
+
+    def send_email(self, **kwargs):
+        return {"status": "sent", "message_id": "msg_1", "provider": "lightfield"}
+
+
+class FakeConfluentProducer:
+    """Raises BufferError for the first full_queue_produces calls, like a full librdkafka queue"""
+
+    def __init__(self, full_queue_produces=0):
+        self.full_queue_produces = full_queue_produces
+        self.produced = []
+        self.polls = []
+
+    def produce(self, topic, **kwargs):
+        if self.full_queue_produces:
+            self.full_queue_produces -= 1
+            raise BufferError("Local: Queue full")
+        self.produced.append((topic, kwargs))
+
+    def poll(self, timeout):
+        self.polls.append(timeout)
+        return 0
+
+
+class FakeKafkaProducer:
+    """KafkaProducerService double exposing the underlying confluent producer"""
+
+    def __init__(self, full_queue_produces=0):
+        self.producer = FakeConfluentProducer(full_queue_produces)
+
+    def delivery_report(self, err, msg):
+        pass
+
+
+@pytest.fixture
+def messaging(monkeypatch):
+    monkeypatch.setattr(worker_module, "get_truefoundry_client", FakeMessaging)
+    monkeypatch.setattr(worker_module, "get_lightfield_client", FakeMessaging)
+
+
+@pytest.fixture
+def scored_lead(db):
+    lead = Lead(lightfield_id="lf_1", company_name="Acme", contact_email="ada@acme.test",
+                score=0.9, status=LeadStatus.SCORED)
+    db.add(lead)
+    db.commit()
+    return lead
+
+
+def test_experiment_counters_are_updated_atomically(db, clock, messaging, experiment, scored_lead):
+    batch_db = SessionLocal(expire_on_commit=False)
+    # The batch session loads the experiment before a concurrent writer changes the row
+    worker_module.select_experiment(batch_db, scored_lead)
+    db.query(Experiment).filter_by(experiment_id="exp_a").update(
+        {"leads_assigned": 3, "outreach_sent": 3, "conversions": 2, "responses_received": 1}
+    )
+    db.commit()
+
+    try:
+        lead = batch_db.get(Lead, scored_lead.id)
+        event = {"lightfield_id": "lf_1", "scoring": {"score": 0.9}}
+        assert worker_module.process_scored_lead(event, batch_db, lead, FakeKafkaProducer()) is True
+    finally:
+        batch_db.close()
+
+    db.expire_all()
+    row = db.query(Experiment).filter_by(experiment_id="exp_a").one()
+    # Increments apply on top of the concurrent write, not the stale loaded values
+    assert (row.leads_assigned, row.outreach_sent) == (4, 4)
+    assert row.conversion_rate == pytest.approx(2 / 4)
+    assert row.response_rate == pytest.approx(1 / 4)
+
+
+def test_update_metrics_uses_the_shared_rates():
+    experiment = Experiment(leads_assigned=4, outreach_sent=0, conversions=1, responses_received=0,
+                            conversion_rate=0.0, response_rate=0.5)
+
+    experiment.update_metrics()
+
+    # A zero denominator leaves its rate untouched
+    assert (experiment.conversion_rate, experiment.response_rate) == (0.25, 0.5)
+
+
+def test_outreach_event_is_retried_once_when_the_producer_queue_is_full(db, clock, messaging, experiment, scored_lead):
+    kafka_producer = FakeKafkaProducer(full_queue_produces=1)
+    event = {"lightfield_id": "lf_1", "scoring": {"score": 0.9}}
+
+    assert worker_module.process_scored_lead(event, db, kafka_producer=kafka_producer) is True
+
+    ((topic, produced),) = kafka_producer.producer.produced
+    assert topic == "outreach.events"
+    assert produced["key"] == b"lf_1"
+    assert orjson.loads(produced["value"])["event_type"] == "outreach.sent"
+    # Drained before the retry, then a non-blocking poll for delivery callbacks
+    assert kafka_producer.producer.polls == [1.0, 0]
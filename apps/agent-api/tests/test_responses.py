@@ -0,0 +1,15 @@
+"""orjson-backed default response class"""
+from datetime import datetime, timezone
+
+from app.responses import OrjsonResponse
+
+
+def test_renders_compact_json_with_native_datetimes():
+    response = OrjsonResponse({"at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), "ids": [1, 2]})
+
+    assert response.body == b'{"at":"2024-05-01T12:30:00+00:00","ids":[1,2]}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_renders_non_string_keys():
+    assert OrjsonResponse({1: "a"}).body == b'{"1":"a"}'
@@ -0,0 +1,40 @@
+"""Template rendering for mock message generation"""
+from app.services.truefoundry_client import _compile_template, _render_template
+
+
+def test_placeholders_are_substituted():
+    template = "Hi {{contact_name}}, congrats to {{company_name}} on {{company_name}}'s raise"
+
+    rendered = _render_template(template, {"contact_name": "Ada", "company_name": "Acme"})
+
+    assert rendered == "Hi Ada, congrats to Acme on Acme's raise"
+
+
+def test_unknown_placeholders_are_left_as_is():
+    assert _render_template("Hi {{contact_name}} at {{company_name}}", {"contact_name": "Ada"}) == (
+        "Hi Ada at {{company_name}}"
+    )
+
+
+def test_values_are_stringified_and_not_reinterpreted():
+    # Substituted values are never re-scanned for placeholders
+    rendered = _render_template("{{a}} and {{b}}", {"a": "{{b}}", "b": 42})
+
+    assert rendered == "{{b}} and 42"
+
+
+def test_non_placeholder_braces_pass_through():
+    template = "Budget: {single} {{ spaced }} {{}}"
+
+    assert _render_template(template, {"single": "x", "spaced": "y"}) == template
+
+
+def test_template_is_parsed_once_per_body():
+    template = "Hello {{contact_name}} from the parse-cache test"
+    _compile_template.cache_clear()
+
+    _render_template(template, {"contact_name": "Ada"})
+    _render_template(template, {"contact_name": "Grace"})
+
+    info = _compile_template.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
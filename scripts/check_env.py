@@ -40,6 +40,8 @@ def check_env():
     print(f"   - {settings.kafka_topic_leads_raw}")
     print(f"   - {settings.kafka_topic_leads_scored}")
     print(f"   - {settings.kafka_topic_outreach_events}")
+    print(f"   - {settings.kafka_topic_outreach_events_dlq}")
+    print(f"   - {settings.kafka_topic_leads_dlq}")
 
     # API Settings
     print(f"✅ API: {settings.api_host}:{settings.api_port}")
@@ -24,6 +24,11 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# Per-lead "Published lead" INFO lines would break up the progress line
+logging.getLogger("app.services.kafka_producer").setLevel(logging.WARNING)
+
+# Progress line refresh interval when publishing without delay
+PROGRESS_EVERY = 100
 
 
 def main():
@@ -49,24 +54,27 @@ def main():
     published_count = 0
     failed_count = 0
 
-    for i, lead in enumerate(simulator.stream_leads(count=num_leads, delay_seconds=delay), 1):
-        company = lead['company']['name']
-        contact = lead['contact']['name']
-
-        print(f"[{i}/{num_leads}] Publishing: {company} - {contact}")
+    # publish_lead() only enqueues (produce + poll(0)); delivery happens in the
+    # background and is confirmed by the single flush below. Progress is shown
+    # on one rewritten line instead of several prints per lead.
+    progress_every = 1 if delay > 0 else PROGRESS_EVERY
+    leads = simulator.stream_leads(count=num_leads, delay_seconds=delay, verbose=False)
 
-        success = producer.publish_lead(lead)
-        if success:
+    for i, lead in enumerate(leads, 1):
+        if producer.publish_lead(lead):
             published_count += 1
-            print(f"  ✅ Published to Kafka")
         else:
             failed_count += 1
-            print(f"  ❌ Failed to publish")
+
+        if i % progress_every == 0 or i == num_leads:
+            sys.stdout.write(f"\r[{i}/{num_leads}] Queued: {published_count}  Failed: {failed_count}")
+            sys.stdout.flush()
 
     # Flush remaining messages
     print()
+    print()
     print("Flushing Kafka producer...")
-    producer.flush(timeout=10.0)
+    producer.flush(timeout=30.0)
 
     # Summary
     print()
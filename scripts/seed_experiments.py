@@ -4,6 +4,9 @@ Seed database with demo experiments and outreach templates for Phase 2 testing
 """
 import sys
 from pathlib import Path
+from typing import Final
+
+from sqlalchemy import insert
 
 # Add repository paths
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -14,6 +17,47 @@ from app.models.base import SessionLocal
 from app.models.experiment import Experiment
 from app.models.outreach_template import OutreachTemplate
 
+# Static email bodies, built once at import and shared by every seed run
+ENTERPRISE_FORMAL_BODY: Final[str] = """Hi {{contact_name}},
+
+I noticed {{company_name}}'s presence in {{industry}} and thought you might be interested in how we're helping similar enterprises automate their sales pipeline with AI.
+
+Quick context: We've helped companies reduce manual lead qualification time by 70% while increasing conversion rates.
+
+Would you be open to a brief 15-minute call next week to explore if there's a fit?
+
+Best regards,
+Pipeline Whisperer Team"""
+
+ENTERPRISE_CASUAL_BODY: Final[str] = """Hey {{contact_name}},
+
+Hope this finds you well! I've been following {{company_name}} and was impressed by your work in {{industry}}.
+
+We're building something that might be interesting for your team - basically an AI that handles the boring parts of sales outreach (scoring leads, personalizing messages, A/B testing approaches).
+
+Curious if you'd be up for a quick 10-minute chat sometime? No pressure - just wanted to share what we're seeing work for similar companies.
+
+Cheers,
+Pipeline Whisperer Team
+
+P.S. - We're in beta, so there might be some interesting early-adopter perks we could discuss 😊"""
+
+SMB_VALUE_BODY: Final[str] = """Hi {{contact_name}},
+
+Quick question: How much time does your team spend manually reaching out to leads each week?
+
+We built Pipeline Whisperer to automate exactly that - AI handles lead scoring, message personalization, and A/B testing so you can focus on closing deals.
+
+Want to try it free for 14 days? No credit card required.
+
+{{company_name}} seems like a great fit based on your industry ({{industry}}).
+
+Let me know!
+
+Best,
+Pipeline Whisperer Team"""
+
+
 def seed_experiments():
     """Create demo A/B test experiments"""
     db = SessionLocal()
@@ -22,7 +66,7 @@ def seed_experiments():
         print("🌱 Seeding experiments and templates...")
 
         # Experiment 1: Enterprise - Formal Tone
-        exp1 = Experiment(
+        exp1 = dict(
             experiment_id="exp_enterprise_formal_v1",
             name="Enterprise Outreach - Formal Tone",
             description="Formal, executive-level messaging for enterprise personas",
@@ -37,22 +81,13 @@ def seed_experiments():
             is_active=True,
         )
 
-        template1 = OutreachTemplate(
+        template1 = dict(
             template_id="tpl_enterprise_formal_v1",
             experiment_id="exp_enterprise_formal_v1",
             name="Enterprise Formal Email",
             description="Professional outreach for C-level/VP personas",
             subject_line="Re: {{company_name}} - Enterprise AI Opportunity",
-            body_template="""Hi {{contact_name}},
-
-I noticed {{company_name}}'s presence in {{industry}} and thought you might be interested in how we're helping similar enterprises automate their sales pipeline with AI.
-
-Quick context: We've helped companies reduce manual lead qualification time by 70% while increasing conversion rates.
-
-Would you be open to a brief 15-minute call next week to explore if there's a fit?
-
-Best regards,
-Pipeline Whisperer Team""",
+            body_template=ENTERPRISE_FORMAL_BODY,
             personalization_prompt="Keep tone professional and concise. Focus on ROI and enterprise value proposition.",
             channel="email",
             config={"follow_up_days": 3, "max_follow_ups": 2},
@@ -60,7 +95,7 @@ Pipeline Whisperer Team""",
         )
 
         # Experiment 2: Enterprise - Casual Tone
-        exp2 = Experiment(
+        exp2 = dict(
             experiment_id="exp_enterprise_casual_v1",
             name="Enterprise Outreach - Casual Tone",
             description="Friendly, conversational messaging for enterprise personas",
@@ -75,24 +110,13 @@ Pipeline Whisperer Team""",
             is_active=True,
         )
 
-        template2 = OutreachTemplate(
+        template2 = dict(
             template_id="tpl_enterprise_casual_v1",
             experiment_id="exp_enterprise_casual_v1",
             name="Enterprise Casual Email",
             description="Friendly outreach for C-level/VP personas",
             subject_line="Quick thought for {{company_name}}",
-            body_template="""Hey {{contact_name}},
-
-Hope this finds you well! I've been following {{company_name}} and was impressed by your work in {{industry}}.
-
-We're building something that might be interesting for your team - basically an AI that handles the boring parts of sales outreach (scoring leads, personalizing messages, A/B testing approaches).
-
-Curious if you'd be up for a quick 10-minute chat sometime? No pressure - just wanted to share what we're seeing work for similar companies.
-
-Cheers,
-Pipeline Whisperer Team
-
-P.S. - We're in beta, so there might be some interesting early-adopter perks we could discuss 😊""",
+            body_template=ENTERPRISE_CASUAL_BODY,
             personalization_prompt="Use conversational tone, add relevant emoji, mention specific company details if available.",
             channel="email",
             config={"follow_up_days": 4, "max_follow_ups": 1},
@@ -100,7 +124,7 @@ P.S. - We're in beta, so there might be some interesting early-adopter perks we
         )
 
         # Experiment 3: SMB - Value-Focused
-        exp3 = Experiment(
+        exp3 = dict(
             experiment_id="exp_smb_value_v1",
             name="SMB Outreach - Value Proposition",
             description="Direct value-focused messaging for small/medium business",
@@ -115,46 +139,34 @@ P.S. - We're in beta, so there might be some interesting early-adopter perks we
             is_active=True,
         )
 
-        template3 = OutreachTemplate(
+        template3 = dict(
             template_id="tpl_smb_value_v1",
             experiment_id="exp_smb_value_v1",
             name="SMB Value-Focused Email",
             description="Direct value prop for SMB personas",
             subject_line="Save 10+ hours/week on sales outreach",
-            body_template="""Hi {{contact_name}},
-
-Quick question: How much time does your team spend manually reaching out to leads each week?
-
-We built Pipeline Whisperer to automate exactly that - AI handles lead scoring, message personalization, and A/B testing so you can focus on closing deals.
-
-Want to try it free for 14 days? No credit card required.
-
-{{company_name}} seems like a great fit based on your industry ({{industry}}).
-
-Let me know!
-
-Best,
-Pipeline Whisperer Team""",
+            body_template=SMB_VALUE_BODY,
             personalization_prompt="Be direct and value-focused. Highlight time savings and ease of use.",
             channel="email",
             config={"follow_up_days": 7, "max_follow_ups": 1},
             is_active=True,
         )
 
-        # Add to database
-        db.add_all([exp1, exp2, exp3])
-        db.add_all([template1, template2, template3])
+        experiment_rows = [exp1, exp2, exp3]
+        template_rows = [template1, template2, template3]
+
+        # Bulk insert via Core executemany (insertmanyvalues) - no ORM unit of work
+        db.execute(insert(Experiment), experiment_rows)
+        db.execute(insert(OutreachTemplate), template_rows)
         db.commit()
 
-        print("\n✅ Seeded 3 experiments:")
-        print(f"  - {exp1.experiment_id}: {exp1.name}")
-        print(f"  - {exp2.experiment_id}: {exp2.name}")
-        print(f"  - {exp3.experiment_id}: {exp3.name}")
+        print(f"\n✅ Seeded {len(experiment_rows)} experiments:")
+        for row in experiment_rows:
+            print(f"  - {row['experiment_id']}: {row['name']}")
 
-        print("\n✅ Seeded 3 templates:")
-        print(f"  - {template1.template_id}: {template1.name}")
-        print(f"  - {template2.template_id}: {template2.name}")
-        print(f"  - {template3.template_id}: {template3.name}")
+        print(f"\n✅ Seeded {len(template_rows)} templates:")
+        for row in template_rows:
+            print(f"  - {row['template_id']}: {row['name']}")
 
         print("\n🎯 Experiments are now ready for Phase 2 testing!")
 
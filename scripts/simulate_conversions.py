@@ -4,11 +4,12 @@ Simulate lead conversions for demo/testing Phase 3 feedback loop
 Publishes conversion events to Kafka to trigger Thompson Sampling updates
 """
 import sys
-import json
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
+
 # Add repository paths
 REPO_ROOT = Path(__file__).resolve().parents[1]
 APP_ROOT = REPO_ROOT / "apps" / "agent-api"
@@ -16,7 +17,66 @@ sys.path.insert(0, str(APP_ROOT))
 
 from app.models.base import SessionLocal
 from app.models.lead import Lead
-from app.services.kafka_producer import get_kafka_producer
+from app.services.kafka_producer import KafkaProducerService, get_kafka_producer
+
+CONVERSION_TOPIC = "outreach.events"
+
+
+def _produce_conversion(
+    kafka_producer: KafkaProducerService,
+    lead: Lead,
+    conversion_value: float,
+    now_iso: str,
+) -> dict:
+    """Queue a conversion event for a lead without waiting for delivery"""
+    conversion_event = {
+        "event_type": "outreach.converted",
+        "timestamp": now_iso,
+        "lead_id": lead.id,
+        "lightfield_id": lead.lightfield_id,
+        "experiment_id": lead.experiment_id,
+        "conversion_value": conversion_value,
+        "converted_at": now_iso,
+    }
+
+    key = lead.lightfield_id.encode('utf-8')
+    value = orjson.dumps(conversion_event)
+    try:
+        kafka_producer.producer.produce(CONVERSION_TOPIC, key=key, value=value)
+    except BufferError:
+        # Local queue is full - let librdkafka drain it, then retry once
+        kafka_producer.producer.poll(1.0)
+        kafka_producer.producer.produce(CONVERSION_TOPIC, key=key, value=value)
+    # Serve delivery callbacks without blocking on the broker
+    kafka_producer.producer.poll(0)
+
+    return conversion_event
+
+
+def publish_conversions(
+    kafka_producer: KafkaProducerService,
+    conversions: list[tuple[Lead, float]],
+    timeout: float = 10.0,
+) -> list[dict]:
+    """
+    Produce conversion events for all leads, then flush once
+
+    Args:
+        kafka_producer: Shared Kafka producer service
+        conversions: (lead, conversion_value) pairs to publish
+        timeout: Maximum time to wait for delivery in seconds
+
+    Returns:
+        The published conversion events
+    """
+    # One timestamp for the whole batch
+    now_iso = datetime.now(timezone.utc).isoformat()
+    events = [
+        _produce_conversion(kafka_producer, lead, conversion_value, now_iso)
+        for lead, conversion_value in conversions
+    ]
+    kafka_producer.flush(timeout=timeout)
+    return events
 
 
 def simulate_conversion(lead_id: Optional[int] = None, lightfield_id: Optional[str] = None):
@@ -52,36 +112,15 @@ def simulate_conversion(lead_id: Optional[int] = None, lightfield_id: Optional[s
             print(f"❌ Lead {lead.lightfield_id} has no experiment assigned")
             return False
 
-        print(f"\n🎯 Simulating conversion for lead: {lead.lightfield_id}")
-        print(f"   Company: {lead.company_name}")
-        print(f"   Score: {lead.score}")
-        print(f"   Experiment: {lead.experiment_id}")
-
         # Publish conversion event to Kafka
         kafka_producer = get_kafka_producer()
+        (conversion_event,) = publish_conversions(kafka_producer, [(lead, 1000.0)])  # Demo value
 
-        conversion_event = {
-            "event_type": "outreach.converted",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "lead_id": lead.id,
-            "lightfield_id": lead.lightfield_id,
-            "experiment_id": lead.experiment_id,
-            "conversion_value": 1000.0,  # Demo value
-            "converted_at": datetime.now(timezone.utc).isoformat(),
-        }
-
-        kafka_producer.producer.produce(
-            "outreach.events",
-            key=lead.lightfield_id.encode('utf-8'),
-            value=json.dumps(conversion_event).encode('utf-8'),
+        print(
+            f"\n✅ {conversion_event['event_type']} published to {CONVERSION_TOPIC} for lead "
+            f"{lead.lightfield_id} (id={lead.id}, company={lead.company_name}, score={lead.score}, "
+            f"experiment={lead.experiment_id}) - feedback_loop_worker will update Thompson Sampling priors"
         )
-        kafka_producer.producer.flush()
-
-        print(f"\n✅ Conversion event published to outreach.events")
-        print(f"   Event type: {conversion_event['event_type']}")
-        print(f"   Lead ID: {lead.id}")
-        print(f"   Experiment: {lead.experiment_id}")
-        print(f"\n💡 Thompson Sampling priors will be updated by feedback_loop_worker")
 
         return True
 
@@ -100,41 +139,30 @@ def simulate_multiple_conversions(count: int = 5):
     db = SessionLocal()
 
     try:
-        # Get recent contacted leads
-        leads = (
+        # Stream recent contacted leads through a server-side cursor so large
+        # counts don't materialize every Lead at once
+        query = (
             db.query(Lead)
             .filter(Lead.status == 'CONTACTED')
             .filter(Lead.experiment_id != None)
             .order_by(Lead.contacted_at.desc())
             .limit(count)
-            .all()
         )
+        total = query.count()
 
-        print(f"\n🎲 Simulating {len(leads)} conversions...")
+        print(f"\n🎲 Simulating {total} conversions...")
 
         kafka_producer = get_kafka_producer()
+        now_iso = datetime.now(timezone.utc).isoformat()
 
-        for i, lead in enumerate(leads, 1):
-            print(f"\n[{i}/{len(leads)}] Converting {lead.company_name} (experiment={lead.experiment_id})")
-
-            conversion_event = {
-                "event_type": "outreach.converted",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "lead_id": lead.id,
-                "lightfield_id": lead.lightfield_id,
-                "experiment_id": lead.experiment_id,
-                "conversion_value": 1000.0 * (i / len(leads)),  # Varying values
-            }
-
-            kafka_producer.producer.produce(
-                "outreach.events",
-                key=lead.lightfield_id.encode('utf-8'),
-                value=json.dumps(conversion_event).encode('utf-8'),
-            )
+        experiments = set()
+        for i, lead in enumerate(query.yield_per(500), 1):
+            _produce_conversion(kafka_producer, lead, 1000.0 * (i / total), now_iso)  # Varying values
+            experiments.add(lead.experiment_id)
 
-        kafka_producer.producer.flush()
+        kafka_producer.flush(timeout=10.0)
 
-        print(f"\n✅ {len(leads)} conversion events published!")
+        print(f"\n✅ {total} conversion events published across {len(experiments)} experiments!")
         print(f"\n💡 Run feedback_loop_worker to process these events and update Thompson Sampling priors")
 
     except Exception as e:
@@ -34,6 +34,8 @@ echo "Creating Kafka topics..."
 docker exec pipeline-redpanda rpk topic create leads.raw --partitions 3 --replicas 1 || echo "  Topic leads.raw already exists"
 docker exec pipeline-redpanda rpk topic create leads.scored --partitions 3 --replicas 1 || echo "  Topic leads.scored already exists"
 docker exec pipeline-redpanda rpk topic create outreach.events --partitions 3 --replicas 1 || echo "  Topic outreach.events already exists"
+docker exec pipeline-redpanda rpk topic create outreach.events.dlq --partitions 1 --replicas 1 || echo "  Topic outreach.events.dlq already exists"
+docker exec pipeline-redpanda rpk topic create leads.dlq --partitions 1 --replicas 1 || echo "  Topic leads.dlq already exists"
 
 echo ""
 echo "✅ All services are up and running!"
@@ -5,11 +5,22 @@ Generates realistic lead events for demo and testing purposes
 import json
 import random
 import time
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 from typing import Dict, Any
 from faker import Faker
 
-fake = Faker()
+# Only the providers generate_lead draws from (company, catch_phrase, name,
+# email, user_name, url, word) - skips loading the rest
+FAKER_PROVIDERS = [
+    "faker.providers.company",
+    "faker.providers.internet",
+    "faker.providers.person",
+    "faker.providers.misc",
+    "faker.providers.lorem",
+]
+
+fake = Faker(providers=FAKER_PROVIDERS)
 
 # Sample industries and company sizes
 INDUSTRIES = [
@@ -24,6 +35,16 @@ TITLES = [
     "Product Manager", "Head of Growth", "VP of Sales", "Director of Marketing"
 ]
 
+CHANNELS = ["website", "referral", "linkedin", "conference", "webinar"]
+
+TECH_STACK = ["React", "Node.js", "Python", "Kubernetes", "AWS", "GCP", "PostgreSQL", "MongoDB"]
+
+PAIN_POINTS = ["scalability", "performance", "cost", "reliability", "security", "compliance"]
+
+BUDGET_RANGES = ["<10k", "10k-50k", "50k-100k", "100k-500k", "500k+"]
+
+TIMELINES = ["immediate", "1-3 months", "3-6 months", "6-12 months"]
+
 
 class LightfieldSimulator:
     """Generate synthetic Lightfield CRM lead events"""
@@ -36,61 +57,83 @@ class LightfieldSimulator:
 
     def generate_lead(self) -> Dict[str, Any]:
         """Generate a single realistic lead"""
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, count: int = 10) -> list[Dict[str, Any]]:
+        """Generate multiple leads"""
+        # Draw each categorical column for the whole batch in one call
+        industries = random.choices(INDUSTRIES, k=count)
+        sizes = random.choices(COMPANY_SIZES, k=count)
+        titles = random.choices(TITLES, k=count)
+        channels = random.choices(CHANNELS, k=count)
+        budgets = random.choices(BUDGET_RANGES, k=count)
+        timelines = random.choices(TIMELINES, k=count)
+
+        return [
+            self._build_lead(industries[i], sizes[i], titles[i], channels[i], budgets[i], timelines[i])
+            for i in range(count)
+        ]
+
+    def _build_lead(
+        self,
+        industry: str,
+        size: str,
+        title: str,
+        channel: str,
+        budget_range: str,
+        timeline: str,
+    ) -> Dict[str, Any]:
+        """Assemble a lead event from pre-drawn categorical values"""
         company_name = fake.company()
         domain = company_name.lower().replace(" ", "").replace(",", "") + ".com"
 
-        from datetime import timezone as tz
-
         lead = {
             "event_type": "lead.created",
-            "timestamp": datetime.now(tz.utc).isoformat().replace("+00:00", "Z"),
-            "lightfield_id": f"lf_{fake.uuid4()}",
+            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "lightfield_id": f"lf_{uuid.uuid4().hex}",
             "company": {
                 "name": company_name,
                 "website": f"https://{domain}",
-                "industry": random.choice(INDUSTRIES),
-                "size": random.choice(COMPANY_SIZES),
+                "industry": industry,
+                "size": size,
                 "description": fake.catch_phrase(),
             },
             "contact": {
                 "name": fake.name(),
                 "email": fake.email(domain=domain),
-                "title": random.choice(TITLES),
+                "title": title,
                 "linkedin": f"https://linkedin.com/in/{fake.user_name()}",
             },
             "source": {
-                "channel": random.choice(["website", "referral", "linkedin", "conference", "webinar"]),
+                "channel": channel,
                 "campaign": fake.word(),
                 "referrer": fake.url() if random.random() > 0.5 else None,
             },
             "metadata": {
-                "tech_stack": random.sample(
-                    ["React", "Node.js", "Python", "Kubernetes", "AWS", "GCP", "PostgreSQL", "MongoDB"],
-                    k=random.randint(2, 5)
-                ),
-                "pain_points": random.sample(
-                    ["scalability", "performance", "cost", "reliability", "security", "compliance"],
-                    k=random.randint(1, 3)
-                ),
-                "budget_range": random.choice(["<10k", "10k-50k", "50k-100k", "100k-500k", "500k+"]),
-                "timeline": random.choice(["immediate", "1-3 months", "3-6 months", "6-12 months"]),
+                "tech_stack": random.sample(TECH_STACK, k=random.randint(2, 5)),
+                "pain_points": random.sample(PAIN_POINTS, k=random.randint(1, 3)),
+                "budget_range": budget_range,
+                "timeline": timeline,
             },
         }
 
         return lead
 
-    def generate_batch(self, count: int = 10) -> list[Dict[str, Any]]:
-        """Generate multiple leads"""
-        return [self.generate_lead() for _ in range(count)]
-
-    def stream_leads(self, count: int = 100, delay_seconds: float = 2.0):
+    def stream_leads(self, count: int = 100, delay_seconds: float = 2.0, verbose: bool = True):
         """Generator that yields leads with delay (simulates real-time stream)"""
+        # Pace against a monotonic schedule so time spent generating (and in
+        # the consumer between yields) comes out of the delay instead of adding to it
+        deadline = time.monotonic()
         for i in range(count):
+            if i:
+                deadline += delay_seconds
+                sleep_for = deadline - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
             lead = self.generate_lead()
-            print(f"[{i+1}/{count}] Generated lead: {lead['company']['name']} - {lead['contact']['name']}")
+            if verbose:
+                print(f"[{i+1}/{count}] Generated lead: {lead['company']['name']} - {lead['contact']['name']}")
             yield lead
-            if i < count - 1:  # Don't sleep after last lead
-                time.sleep(delay_seconds)
 
 
 def main():
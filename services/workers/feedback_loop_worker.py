@@ -2,15 +2,17 @@
 Kafka consumer worker for processing engagement feedback
 Consumes outreach.events, tracks conversions, updates Thompson Sampling priors
 """
-import json
 import logging
 import sys
 import signal
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
-from confluent_kafka import Consumer, KafkaException
+from confluent_kafka import Consumer, KafkaException, Message, TopicPartition
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
+import orjson
 import sentry_sdk
 
 # Add repository paths for local imports
@@ -26,6 +28,7 @@ from app.models.base import SessionLocal
 from app.models.lead import Lead, LeadStatus
 from app.models.experiment import Experiment
 from app.models.outreach_log import OutreachLog, OutreachStatus
+from app.services.kafka_producer import KafkaProducerService, get_kafka_producer
 
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
@@ -48,6 +51,12 @@ def signal_handler(signum, frame):
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+# Pause between attempts to dead-letter failed events while the DB is unreachable
+DB_RETRY_BACKOFF_SECONDS = 5
+
+# Engagement events that update the lead's latest outreach log
+OUTREACH_LOG_EVENTS = ("outreach.opened", "outreach.clicked", "outreach.replied")
+
 
 def update_thompson_sampling_priors(experiment: Experiment, conversion: bool):
     """
@@ -75,9 +84,13 @@ def update_thompson_sampling_priors(experiment: Experiment, conversion: bool):
     logger.info(f"   Expected conversion rate: {expected_value:.2%} (will explore vs exploit)")
 
 
-def process_engagement_event(event: Dict[str, Any], db: Session) -> bool:
+def apply_engagement_event(
+    event: Dict[str, Any],
+    db: Session,
+    now: Optional[datetime] = None,
+) -> bool:
     """
-    Process engagement/conversion event and update experiment metrics
+    Apply an engagement/conversion event to the session without committing
 
     Event types:
     - outreach.opened: Lead opened email/message
@@ -88,121 +101,142 @@ def process_engagement_event(event: Dict[str, Any], db: Session) -> bool:
     Args:
         event: Engagement event from Kafka
         db: Database session
+        now: Timestamp for *_at fields (defaults to the current UTC time)
 
     Returns:
-        True if successful, False otherwise
+        True if applied (or safely ignored), False if the event is invalid
+
+    Raises:
+        Exception: Database errors are propagated so the caller can roll back
     """
-    try:
-        event_type = event.get("event_type", "")
-        lead_id = event.get("lead_id")
-        experiment_id = event.get("experiment_id")
+    event_type = event.get("event_type", "")
+    lead_id = event.get("lead_id")
+    experiment_id = event.get("experiment_id")
 
-        if not lead_id or not experiment_id:
-            logger.error(f"Missing lead_id or experiment_id in event: {event}")
-            return False
+    if not lead_id or not experiment_id:
+        logger.error(f"Missing lead_id or experiment_id in event: {event}")
+        return False
 
-        # Get lead and experiment
-        lead = db.query(Lead).filter(Lead.id == lead_id).first()
-        experiment = db.query(Experiment).filter(Experiment.experiment_id == experiment_id).first()
+    # Get lead and experiment in one round-trip (both sides hit unique keys)
+    row = db.execute(
+        select(Lead, Experiment)
+        .join(Experiment, Experiment.experiment_id == experiment_id)
+        .where(Lead.id == lead_id)
+    ).first()
 
-        if not lead or not experiment:
-            logger.error(f"Lead {lead_id} or Experiment {experiment_id} not found")
-            return False
+    if row is None:
+        logger.error(f"Lead {lead_id} or Experiment {experiment_id} not found")
+        return False
 
-        # Update based on event type
-        if event_type == "outreach.opened":
-            logger.info(f"📧 Lead {lead.lightfield_id} opened message (experiment={experiment_id})")
-
-            # Update outreach log
-            outreach_log = (
-                db.query(OutreachLog)
-                .filter(
-                    OutreachLog.lead_id == lead_id,
-                    OutreachLog.experiment_id == experiment_id
-                )
-                .order_by(OutreachLog.created_at.desc())
-                .first()
-            )
-            if outreach_log:
-                outreach_log.status = OutreachStatus.OPENED
-                outreach_log.opened_at = datetime.now(timezone.utc)
-
-        elif event_type == "outreach.clicked":
-            logger.info(f"🔗 Lead {lead.lightfield_id} clicked link (experiment={experiment_id})")
-
-            # Update outreach log
-            outreach_log = (
-                db.query(OutreachLog)
-                .filter(
-                    OutreachLog.lead_id == lead_id,
-                    OutreachLog.experiment_id == experiment_id
-                )
-                .order_by(OutreachLog.created_at.desc())
-                .first()
+    lead, experiment = row
+
+    # Id of the latest outreach log for this lead/experiment, fetched once for
+    # the engagement events that update it (served by ix_outreach_logs_lead_experiment_created)
+    outreach_log_id = None
+    if event_type in OUTREACH_LOG_EVENTS:
+        outreach_log_id = db.execute(
+            select(OutreachLog.id)
+            .where(
+                OutreachLog.lead_id == lead_id,
+                OutreachLog.experiment_id == experiment_id
             )
-            if outreach_log:
-                outreach_log.status = OutreachStatus.CLICKED
-                outreach_log.clicked_at = datetime.now(timezone.utc)
-
-        elif event_type == "outreach.replied":
-            logger.info(f"💬 Lead {lead.lightfield_id} replied (experiment={experiment_id})")
-
-            # Update lead status
-            lead.status = LeadStatus.RESPONDED
-            lead.response_count = (lead.response_count or 0) + 1
-
-            # Update outreach log
-            outreach_log = (
-                db.query(OutreachLog)
-                .filter(
-                    OutreachLog.lead_id == lead_id,
-                    OutreachLog.experiment_id == experiment_id
-                )
-                .order_by(OutreachLog.created_at.desc())
-                .first()
-            )
-            if outreach_log:
-                outreach_log.status = OutreachStatus.REPLIED
-                outreach_log.replied_at = datetime.now(timezone.utc)
+            .order_by(OutreachLog.created_at.desc())
+            .limit(1)
+        ).scalar()
 
-            # Update experiment metrics
-            experiment.responses_received = (experiment.responses_received or 0) + 1
+    if now is None:
+        now = datetime.now(timezone.utc)
 
-        elif event_type == "outreach.converted":
-            logger.info(f"🎉 CONVERSION! Lead {lead.lightfield_id} converted (experiment={experiment_id})")
+    # Only replied/converted touch the counters update_metrics() reads
+    metrics_dirty = False
+    outreach_log_values: Dict[str, Any] = {}
 
-            # Update lead status
-            lead.status = LeadStatus.CONVERTED
+    # Update based on event type
+    if event_type == "outreach.opened":
+        logger.info(f"📧 Lead {lead.lightfield_id} opened message (experiment={experiment_id})")
 
-            # Update experiment metrics
-            experiment.conversions = (experiment.conversions or 0) + 1
+        # Update outreach log
+        outreach_log_values = {"status": OutreachStatus.OPENED, "opened_at": now}
 
-            # 🎯 UPDATE THOMPSON SAMPLING PRIORS (CONVERSION = SUCCESS)
-            update_thompson_sampling_priors(experiment, conversion=True)
+    elif event_type == "outreach.clicked":
+        logger.info(f"🔗 Lead {lead.lightfield_id} clicked link (experiment={experiment_id})")
 
-        else:
-            logger.warning(f"Unknown event type: {event_type}")
-            return True  # Not an error, just unknown type
+        # Update outreach log
+        outreach_log_values = {"status": OutreachStatus.CLICKED, "clicked_at": now}
 
-        # Recalculate experiment metrics
-        experiment.update_metrics()
+    elif event_type == "outreach.replied":
+        logger.info(f"💬 Lead {lead.lightfield_id} replied (experiment={experiment_id})")
 
-        # If this was a non-conversion engagement, it's still valuable feedback
-        # We could optionally update priors for "no conversion yet" here
-        if event_type in ["outreach.opened", "outreach.clicked", "outreach.replied"]:
-            # For now, we only update priors on final conversion
-            # But we could implement intermediate rewards here
-            pass
+        # Update lead status
+        lead.status = LeadStatus.RESPONDED
+        lead.response_count = (lead.response_count or 0) + 1
 
-        db.commit()
+        # Update outreach log
+        outreach_log_values = {"status": OutreachStatus.REPLIED, "replied_at": now}
+
+        # Update experiment metrics
+        experiment.responses_received = (experiment.responses_received or 0) + 1
+        metrics_dirty = True
+
+    elif event_type == "outreach.converted":
+        logger.info(f"🎉 CONVERSION! Lead {lead.lightfield_id} converted (experiment={experiment_id})")
+
+        # Update lead status
+        lead.status = LeadStatus.CONVERTED
+
+        # Update experiment metrics
+        experiment.conversions = (experiment.conversions or 0) + 1
+        metrics_dirty = True
+
+        # 🎯 UPDATE THOMPSON SAMPLING PRIORS (CONVERSION = SUCCESS)
+        update_thompson_sampling_priors(experiment, conversion=True)
+
+    else:
+        logger.warning(f"Unknown event type: {event_type}")
+        return True  # Not an error, just unknown type
+
+    if outreach_log_id is not None and outreach_log_values:
+        db.execute(
+            update(OutreachLog)
+            .where(OutreachLog.id == outreach_log_id)
+            .values(**outreach_log_values)
+            .execution_options(synchronize_session=False)
+        )
 
+    # Recalculate experiment metrics
+    if metrics_dirty:
+        experiment.update_metrics()
         logger.info(
             f"Updated metrics for experiment {experiment_id}: "
             f"conversions={experiment.conversions}, "
             f"conversion_rate={experiment.conversion_rate:.2%}"
         )
 
-        return True
+    # If this was a non-conversion engagement, it's still valuable feedback
+    # We could optionally update priors for "no conversion yet" here
+    if event_type in ["outreach.opened", "outreach.clicked", "outreach.replied"]:
+        # For now, we only update priors on final conversion
+        # But we could implement intermediate rewards here
+        pass
+
+    return True
+
+
+def process_engagement_event(event: Dict[str, Any], db: Session) -> bool:
+    """
+    Process engagement/conversion event in its own transaction
+
+    Args:
+        event: Engagement event from Kafka
+        db: Database session
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        success = apply_engagement_event(event, db)
+        db.commit()
+        return success
 
     except Exception as e:
         logger.error(f"Error processing engagement event: {e}", exc_info=True)
@@ -211,13 +245,108 @@ def process_engagement_event(event: Dict[str, Any], db: Session) -> bool:
         return False
 
 
+def process_event_batch(events: List[Dict[str, Any]], db: Session) -> List[bool]:
+    """
+    Apply a batch of events in a single transaction
+
+    If the batch transaction fails, it is rolled back and the events are
+    replayed one transaction each so one bad event doesn't sink the batch.
+
+    Args:
+        events: Decoded engagement events
+        db: Database session
+
+    Returns:
+        Per-event success flags, in order
+    """
+    # One timestamp for the whole batch
+    now = datetime.now(timezone.utc)
+
+    try:
+        results = [apply_engagement_event(event, db, now) for event in events]
+        db.commit()
+        return results
+
+    except Exception as e:
+        logger.warning(f"Batch of {len(events)} events failed ({e}), retrying individually")
+        db.rollback()
+        return [process_engagement_event(event, db) for event in events]
+
+
+def dead_letter_events(
+    failed: List[Message],
+    db: Session,
+    kafka_producer: KafkaProducerService,
+) -> bool:
+    """
+    Publish events that failed processing to the outreach events DLQ
+
+    Args:
+        failed: Original Kafka messages of the failed events
+        db: Database session (checked first - outage failures are not dead-lettered)
+        kafka_producer: Producer for the DLQ topic
+
+    Returns:
+        True once the dead letters are delivered
+    """
+    try:
+        db.execute(select(1))
+    except Exception as e:
+        # DB unreachable - these events didn't fail on their own merits
+        logger.error(f"Database unavailable, not dead-lettering {len(failed)} events: {e}")
+        db.rollback()
+        return False
+
+    for msg in failed:
+        kafka_producer.publish_dead_letter(
+            msg.value(),
+            msg.key(),
+            "processing failed",
+            topic=settings.kafka_topic_outreach_events_dlq,
+        )
+
+    # At-least-once: only move offsets once the dead letters are delivered
+    return kafka_producer.flush(timeout=5.0) == 0
+
+
+def retry_dead_letters(
+    failed: List[Message],
+    db: Session,
+    kafka_producer: KafkaProducerService,
+) -> bool:
+    """
+    Dead-letter failed events, retrying in place until they are delivered
+
+    Returns:
+        False if shutdown was requested first
+    """
+    while not dead_letter_events(failed, db, kafka_producer):
+        if shutdown_flag:
+            return False
+        time.sleep(DB_RETRY_BACKOFF_SECONDS)
+    return True
+
+
+def rewind_to_batch_start(consumer: Consumer, msgs: List[Message]):
+    """Seek each partition back to the batch's first offset so it is consumed again"""
+    first_offsets: Dict[tuple, int] = {}
+    for msg in msgs:
+        if msg.error():
+            continue
+        partition = (msg.topic(), msg.partition())
+        first_offsets[partition] = min(first_offsets.get(partition, msg.offset()), msg.offset())
+
+    for (topic, partition), offset in first_offsets.items():
+        consumer.seek(TopicPartition(topic, partition, offset))
+
+
 def main():
     """Main worker loop"""
     logger.info("🚀 Starting Feedback Loop Worker")
 
     # Kafka consumer configuration
     consumer_config = {
-        'bootstrap.servers': settings.kafka_brokers,
+        'bootstrap.servers': settings.redpanda_brokers,
         'group.id': 'feedback-loop',
         'auto.offset.reset': 'earliest',
         'enable.auto.commit': False,
@@ -226,49 +355,85 @@ def main():
     consumer = Consumer(consumer_config)
     consumer.subscribe(['outreach.events'])
 
-    logger.info(f"📡 Subscribed to outreach.events (brokers: {settings.kafka_brokers})")
+    logger.info(f"📡 Subscribed to outreach.events (brokers: {settings.redpanda_brokers})")
 
     processed_count = 0
     conversion_count = 0
     error_count = 0
 
+    # One session for the worker's lifetime, one transaction per batch
+    db = SessionLocal()
+    kafka_producer = get_kafka_producer()
+    # Offsets of the last async commit, re-committed synchronously on shutdown
+    committed_offsets: List[TopicPartition] = []
+
     try:
         while not shutdown_flag:
-            msg = consumer.poll(timeout=1.0)
-
-            if msg is None:
-                continue
+            msgs = consumer.consume(
+                num_messages=settings.kafka_batch_size,
+                timeout=settings.kafka_poll_timeout_ms / 1000,
+            )
 
-            if msg.error():
-                logger.error(f"Kafka error: {msg.error()}")
+            if not msgs:
                 continue
 
-            # Process message
-            try:
-                event = json.loads(msg.value().decode('utf-8'))
-                event_type = event.get("event_type", "")
-
-                logger.info(f"Processing {event_type} for lead {event.get('lead_id')}")
-
-                db = SessionLocal()
+            events = []
+            event_msgs = []
+            failed = []
+            applied = False
+            consumed = False
+            for msg in msgs:
+                if msg.error():
+                    logger.error(f"Kafka error: {msg.error()}")
+                    continue
+
+                consumed = True
                 try:
-                    success = process_engagement_event(event, db)
+                    event = orjson.loads(msg.value())
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"Error decoding message: {e}", exc_info=True)
+                    sentry_sdk.capture_exception(e)
+                    failed.append(msg)
+                    continue
+
+                logger.info(f"Processing {event.get('event_type', '')} for lead {event.get('lead_id')}")
+                events.append(event)
+                event_msgs.append(msg)
+
+            if events:
+                results = process_event_batch(events, db)
+                applied = any(results)
+                for event, msg, success in zip(events, event_msgs, results):
                     if success:
                         processed_count += 1
-                        if event_type == "outreach.converted":
+                        if event.get("event_type") == "outreach.converted":
                             conversion_count += 1
-                        consumer.commit()
                     else:
                         error_count += 1
-                        logger.warning(f"Failed to process event {event_type}")
-
-                finally:
-                    db.close()
-
-            except Exception as e:
-                error_count += 1
-                logger.error(f"Error processing message: {e}", exc_info=True)
-                sentry_sdk.capture_exception(e)
+                        failed.append(msg)
+                        logger.warning(f"Failed to process event {event.get('event_type', '')}")
+
+            # Failed events are dead-lettered before the batch's offsets are committed
+            if failed:
+                if applied:
+                    # Part of the batch is already committed - consuming it again would
+                    # apply those events twice, so keep retrying the dead letters in place
+                    if not retry_dead_letters(failed, db, kafka_producer):
+                        logger.warning("Shutting down with undelivered dead letters, not committing offsets")
+                        break
+                elif not dead_letter_events(failed, db, kafka_producer):
+                    # Nothing in the batch was committed, so it is safe to consume it again
+                    rewind_to_batch_start(consumer, msgs)
+                    time.sleep(DB_RETRY_BACKOFF_SECONDS)
+                    continue
+
+            # One offset commit per drained batch, off the critical path
+            if consumed:
+                offsets = [tp for tp in consumer.position(consumer.assignment()) if tp.offset >= 0]
+                if offsets:
+                    consumer.commit(offsets=offsets, asynchronous=True)
+                    committed_offsets = offsets
 
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
@@ -278,7 +443,15 @@ def main():
             f"Shutting down... (processed={processed_count}, "
             f"conversions={conversion_count}, errors={error_count})"
         )
+        # Make sure the last async commit landed (never commits unprocessed offsets)
+        try:
+            if committed_offsets:
+                consumer.commit(offsets=committed_offsets, asynchronous=False)
+        except KafkaException as e:
+            logger.error(f"Final offset commit failed: {e}")
         consumer.close()
+        kafka_producer.close()
+        db.close()
 
 
 if __name__ == "__main__":
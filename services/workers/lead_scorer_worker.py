@@ -2,15 +2,25 @@
 Kafka consumer worker for processing raw leads
 Consumes from leads.raw, scores with OpenAI, persists to DB, publishes to leads.scored
 """
-import json
+import asyncio
+import hashlib
 import logging
+import random
 import sys
 import signal
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
-from confluent_kafka import Consumer, KafkaException
+from confluent_kafka import Consumer, KafkaException, Message, TopicPartition
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
+from psycopg.types.json import Json
+import orjson
 import sentry_sdk
 
 # Add repository paths for local imports (avoids machine-specific absolute paths)
@@ -33,15 +43,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Graceful shutdown flag
-shutdown_flag = False
+# In-process cache of OpenAI scores for identical companies
+SCORING_CACHE_TTL_SECONDS = 86400
+SCORING_CACHE_MAX_ENTRIES = 10_000
+
+# lightfield_ids known to be persisted, so replays skip the DB duplicate check
+PROCESSED_IDS_MAX_ENTRIES = 200_000
+
+# Approximate employee counts (bucket midpoints) for Lightfield size labels
+EMPLOYEE_COUNT_BUCKETS = {
+    size: (lower + upper) // 2
+    for size, (lower, upper) in {
+        "1-10": (1, 10),
+        "11-50": (11, 50),
+        "51-200": (51, 200),
+        "201-1000": (201, 1000),
+    }.items()
+}
+
+# Estimated company revenue for Lightfield budget ranges
+REVENUE_BUCKETS = {
+    "<10k": 50_000.0,
+    "10k-50k": 200_000.0,
+    "50k-100k": 500_000.0,
+    "100k-500k": 2_500_000.0,
+    "500k+": 6_000_000.0,
+}
+
+# Plain dict lookup instead of LeadPersona(value) (Enum call + ValueError on misses)
+PERSONA_BY_VALUE = {persona.value: persona for persona in LeadPersona}
+
+# Batches at least this large use COPY when settings.enable_copy_fast_path is on
+COPY_THRESHOLD = 500
+
+# Column order for the COPY fast path (must match _copy_leads)
+COPY_LEADS_SQL = (
+    "COPY leads (lightfield_id, company_name, contact_name, contact_email, contact_title, "
+    "industry, company_size, website, raw_payload, score, persona, scoring_metadata, "
+    "status, scored_at, outreach_count, response_count) FROM STDIN"
+)
+
+# Failed Batch API submissions or persists before a buffer falls back to mock
+# scoring (submissions) or the DLQ (persists)
+MAX_FLUSH_ATTEMPTS = 3
+
+# Processing attempts per batch before unprocessed leads go to the DLQ
+MAX_PROCESSING_ATTEMPTS = 3
+RETRY_BACKOFF_MAX_SECONDS = 30
+
+# Graceful shutdown event (set from the signal handler)
+shutdown_event = threading.Event()
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
-    global shutdown_flag
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-    shutdown_flag = True
+    shutdown_event.set()
 
 
 # Register signal handlers
@@ -49,6 +106,116 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 
+@lru_cache(maxsize=256)
+def _estimate_employee_count(size: Optional[str]) -> int:
+    """Translate company size labels into approximate employee counts"""
+    if not size:
+        return 0
+
+    # Simulator labels are already normalized - skip the parsing below
+    if size in EMPLOYEE_COUNT_BUCKETS:
+        return EMPLOYEE_COUNT_BUCKETS[size]
+
+    size = size.strip().lower()
+
+    if size.endswith("+"):
+        try:
+            lower = int(size.rstrip("+"))
+            upper = lower * 2
+            return (lower + upper) // 2
+        except ValueError:
+            return 0
+
+    if size in EMPLOYEE_COUNT_BUCKETS:
+        return EMPLOYEE_COUNT_BUCKETS[size]
+
+    if "-" in size:
+        lower_str, upper_str = size.split("-", maxsplit=1)
+        try:
+            lower = int(lower_str)
+            upper = int(upper_str)
+            return (lower + upper) // 2
+        except ValueError:
+            return 0
+
+    try:
+        return int(size)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=256)
+def _estimate_revenue(budget_range: Optional[str]) -> float:
+    """Estimate company revenue from budget/tier information"""
+    if not budget_range:
+        return 0.0
+
+    if budget_range in REVENUE_BUCKETS:
+        return REVENUE_BUCKETS[budget_range]
+
+    budget_range = budget_range.strip().lower()
+
+    if budget_range in REVENUE_BUCKETS:
+        return REVENUE_BUCKETS[budget_range]
+
+    if "-" in budget_range:
+        lower_str, upper_str = budget_range.split("-", maxsplit=1)
+        try:
+            lower = float(lower_str.replace("k", "000").replace("$", ""))
+            upper = float(upper_str.replace("k", "000").replace("$", ""))
+            return (lower + upper) / 2.0
+        except ValueError:
+            return 0.0
+
+    if budget_range.endswith("+"):
+        try:
+            value = float(budget_range.rstrip("+").replace("k", "000").replace("$", ""))
+            return value * 1.5
+        except ValueError:
+            return 0.0
+
+    return 0.0
+
+
+@dataclass(slots=True)
+class ScoredLead:
+    """Canonical scoring result for one lead; persistence and event payloads are views of it"""
+    score: float
+    persona: LeadPersona
+    confidence: Optional[float]
+    reasoning: str
+    model_version: str
+    mock: bool
+    scoring_input: Dict[str, Any]
+    raw_response: Dict[str, Any]
+    scored_at: str
+
+    def metadata(self) -> Dict[str, Any]:
+        """Scoring details persisted to Lead.scoring_metadata"""
+        return {
+            "reasoning": self.reasoning,
+            "model_version": self.model_version,
+            "confidence": self.confidence,
+            "mock": self.mock,
+            "scoring_input": self.scoring_input,
+            "raw_response": self.raw_response,
+            "scored_at": self.scored_at,
+        }
+
+    def public_payload(self) -> Dict[str, Any]:
+        """Trimmed scoring payload for downstream events"""
+        return {
+            "score": self.score,
+            "persona": self.persona.value,
+            "reasoning": self.reasoning,
+            "model_version": self.model_version,
+            "mock": self.mock,
+            "confidence": self.confidence,
+            "scoring_input": self.scoring_input,
+            "scored_at": self.scored_at,
+        }
+
+
 class LeadScorerWorker:
     """Worker that consumes raw leads, scores them, and persists to database"""
 
@@ -60,14 +227,38 @@ class LeadScorerWorker:
             'auto.offset.reset': 'earliest',
             'enable.auto.commit': False,  # Manual commit for reliability
             'max.poll.interval.ms': 300000,  # 5 minutes
+            # Let the broker accumulate real batches instead of answering each fetch immediately,
+            # and keep a deep local prefetch queue so consume() is usually served from memory
+            'fetch.min.bytes': 1048576,
+            'fetch.wait.max.ms': settings.kafka_fetch_wait_max_ms,
+            'fetch.message.max.bytes': 1048576,
+            'queued.min.messages': 100000,
+            'queued.max.messages.kbytes': 65536,
         }
         self.consumer = Consumer(self.consumer_config)
         self.consumer.subscribe([settings.kafka_topic_leads_raw])
+        # Offsets of the last async commit, re-committed synchronously on shutdown
+        self.committed_offsets: List[TopicPartition] = []
 
         self.producer = get_kafka_producer()
-        self.db: Session = SessionLocal()
+        # Nothing is read back from ORM instances after commit - skip the expiry bookkeeping
+        self.db: Session = SessionLocal(expire_on_commit=False)
         self.scoring_client: OpenAIScoringClient = get_openai_scoring_client()
 
+        # Long-lived event loop so the async HTTP client's connection pool is
+        # reused across batches; the semaphore caps in-flight scoring calls
+        self.loop = asyncio.new_event_loop()
+        self.scoring_semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
+
+        # fingerprint -> (expires_at, scoring client result), oldest first
+        self.scoring_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # Recently persisted lightfield_ids, oldest first (exact - only added after commit)
+        self.processed_ids: "OrderedDict[str, None]" = OrderedDict()
+
+        # Why each lead in the current batch failed, by lightfield_id (DLQ error header)
+        self.lead_errors: Dict[str, str] = {}
+
         logger.info(f"Lead scorer worker initialized")
         logger.info(f"Subscribed to: {settings.kafka_topic_leads_raw}")
 
@@ -75,48 +266,93 @@ class LeadScorerWorker:
         health = self.scoring_client.health_check()
         logger.info(f"Scoring client status: {health.get('status')}")
 
-    def score_lead_with_openai(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def score_lead_with_openai(self, lead_data: Dict[str, Any], scored_at: str) -> ScoredLead:
         """
         Score lead using OpenAI API
 
         Args:
             lead_data: Raw lead data from Lightfield
+            scored_at: ISO timestamp recorded on the result
 
         Returns:
             Scoring results with score and persona
         """
-        # Extract company data for scoring
-        company = lead_data.get('company', {})
-        metadata = lead_data.get('metadata', {})
+        scoring_input = self._scoring_input_for(lead_data)
 
-        scoring_input = self._prepare_scoring_payload(company, metadata)
+        cache_key = self._scoring_cache_key(scoring_input)
+        result = self._get_cached_score(cache_key)
 
-        # Call scoring client
-        result = self.scoring_client.score_lead(scoring_input)
+        if result is None:
+            # Call scoring client
+            async with self.scoring_semaphore:
+                result = await self.scoring_client.score_lead_async(scoring_input)
 
-        persona_enum = self._to_persona_enum(result.get('persona'))
+            # Don't pin mock fallbacks (API errors) for the TTL
+            if not result.get('mock'):
+                self._cache_score(cache_key, result)
 
-        return {
-            'score': float(result.get('score', 0.5)),
-            'persona': persona_enum.value,
-            'confidence': result.get('confidence'),
-            'reasoning': result.get('reasoning', 'OpenAI scoring'),
-            'model_version': result.get('model_version', 'openai-v1.0'),
-            'mock': result.get('mock', False),
-            'scoring_input': scoring_input,
-            'raw_response': result,
-            'scored_at': datetime.now(timezone.utc).isoformat(),
+        return self._build_scoring_result(scoring_input, result, scored_at)
+
+    def _scoring_cache_key(self, scoring_input: Dict[str, Any]) -> str:
+        """Fingerprint a normalized scoring input (case/whitespace-insensitive)"""
+        normalized = {
+            key: value.strip().lower() if isinstance(value, str) else value
+            for key, value in scoring_input.items()
         }
+        encoded = orjson.dumps(normalized, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _get_cached_score(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached scoring result if present and not expired"""
+        entry = self.scoring_cache.get(cache_key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self.scoring_cache[cache_key]
+            return None
+
+        self.scoring_cache.move_to_end(cache_key)
+        return result
+
+    def _cache_score(self, cache_key: str, result: Dict[str, Any]):
+        """Cache a scoring result, evicting the least recently used entry when full"""
+        self.scoring_cache[cache_key] = (time.monotonic() + SCORING_CACHE_TTL_SECONDS, result)
+        self.scoring_cache.move_to_end(cache_key)
+        if len(self.scoring_cache) > SCORING_CACHE_MAX_ENTRIES:
+            self.scoring_cache.popitem(last=False)
+
+    def _scoring_input_for(self, lead_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract company data for scoring"""
+        company = lead_data.get('company', {})
+        metadata = lead_data.get('metadata', {})
+        return self._prepare_scoring_payload(company, metadata)
+
+    def _build_scoring_result(
+        self,
+        scoring_input: Dict[str, Any],
+        result: Dict[str, Any],
+        scored_at: str,
+    ) -> ScoredLead:
+        """Normalize a scoring client result for persistence and publishing"""
+        return ScoredLead(
+            score=float(result.get('score', 0.5)),
+            persona=self._to_persona_enum(result.get('persona')),
+            confidence=result.get('confidence'),
+            reasoning=result.get('reasoning', 'OpenAI scoring'),
+            model_version=result.get('model_version', 'openai-v1.0'),
+            mock=result.get('mock', False),
+            scoring_input=scoring_input,
+            raw_response=result,
+            scored_at=scored_at,
+        )
 
     def _to_persona_enum(self, persona_value: Optional[str]) -> LeadPersona:
         """Safely convert persona string to LeadPersona enum"""
         if not persona_value:
             return LeadPersona.UNKNOWN
-        persona_value = persona_value.lower()
-        try:
-            return LeadPersona(persona_value)
-        except ValueError:
-            return LeadPersona.UNKNOWN
+        return PERSONA_BY_VALUE.get(persona_value.lower(), LeadPersona.UNKNOWN)
 
     def _prepare_scoring_payload(self, company: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize Lightfield company payload for scoring model input"""
@@ -126,210 +362,310 @@ class LeadScorerWorker:
         return {
             "company_name": company.get('name') or "Unknown",
             "industry": company.get('industry') or metadata.get('industry') or "unknown",
-            "employee_count": self._estimate_employee_count(size_bucket),
-            "revenue": self._estimate_revenue(budget_range),
+            "employee_count": _estimate_employee_count(size_bucket),
+            "revenue": _estimate_revenue(budget_range),
             "website": company.get('website') or metadata.get('website') or "",
         }
 
-    def _estimate_employee_count(self, size: Optional[str]) -> int:
-        """Translate company size labels into approximate employee counts"""
-        if not size:
-            return 0
+    def filter_new_leads(self, leads: List[Dict[str, Any]], seen_ids: set) -> List[Dict[str, Any]]:
+        """
+        Drop leads that are already persisted or repeated
 
-        size = size.strip().lower()
-        bucket_map = {
-            "1-10": (1, 10),
-            "11-50": (11, 50),
-            "51-200": (51, 200),
-            "201-1000": (201, 1000),
-        }
+        Args:
+            leads: Raw lead events
+            seen_ids: lightfield_ids already accepted (updated in place)
 
-        if size.endswith("+"):
-            try:
-                lower = int(size.rstrip("+"))
-                upper = lower * 2
-                return (lower + upper) // 2
-            except ValueError:
-                return 0
-
-        if size in bucket_map:
-            lower, upper = bucket_map[size]
-            return (lower + upper) // 2
+        Returns:
+            Leads not yet in the database or in seen_ids, in order
+        """
+        lightfield_ids = [lead_data.get('lightfield_id') for lead_data in leads]
+
+        # Only ids not already known to be persisted need the DB check - on a
+        # replay after a crash most of the batch is answered from memory
+        candidates = [lightfield_id for lightfield_id in lightfield_ids if lightfield_id not in self.processed_ids]
+        existing_ids = set()
+        if candidates:
+            # One indexed IN lookup per batch instead of a SELECT per lead
+            existing_ids = set(
+                self.db.execute(
+                    select(Lead.lightfield_id).where(Lead.lightfield_id.in_(candidates))
+                ).scalars()
+            )
+            self._remember_processed(existing_ids)
 
-        if "-" in size:
-            lower_str, upper_str = size.split("-", maxsplit=1)
-            try:
-                lower = int(lower_str)
-                upper = int(upper_str)
-                return (lower + upper) // 2
-            except ValueError:
-                return 0
+        new_leads = []
+        for lead_data, lightfield_id in zip(leads, lightfield_ids):
+            logger.info(f"Processing lead: {lightfield_id}")
 
-        try:
-            return int(size)
-        except ValueError:
-            return 0
+            if lightfield_id in self.processed_ids or lightfield_id in existing_ids or lightfield_id in seen_ids:
+                logger.info(f"Lead {lightfield_id} already processed, skipping")
+                continue
 
-    def _estimate_revenue(self, budget_range: Optional[str]) -> float:
-        """Estimate company revenue from budget/tier information"""
-        if not budget_range:
-            return 0.0
+            seen_ids.add(lightfield_id)
+            new_leads.append(lead_data)
 
-        budget_range = budget_range.strip().lower()
-        bucket_estimates = {
-            "<10k": 50_000,
-            "10k-50k": 200_000,
-            "50k-100k": 500_000,
-            "100k-500k": 2_500_000,
-            "500k+": 6_000_000,
-        }
+        return new_leads
 
-        if budget_range in bucket_estimates:
-            return float(bucket_estimates[budget_range])
+    def _remember_processed(self, lightfield_ids) -> None:
+        """Record persisted lightfield_ids, evicting the oldest when full"""
+        for lightfield_id in lightfield_ids:
+            self.processed_ids[lightfield_id] = None
+            self.processed_ids.move_to_end(lightfield_id)
+        while len(self.processed_ids) > PROCESSED_IDS_MAX_ENTRIES:
+            self.processed_ids.popitem(last=False)
 
-        if "-" in budget_range:
-            lower_str, upper_str = budget_range.split("-", maxsplit=1)
-            try:
-                lower = float(lower_str.replace("k", "000").replace("$", ""))
-                upper = float(upper_str.replace("k", "000").replace("$", ""))
-                return (lower + upper) / 2.0
-            except ValueError:
-                return 0.0
+    async def _score_batch(self, leads: List[Dict[str, Any]], scored_at: str) -> List[Any]:
+        """Score leads concurrently; failures are returned in place as exceptions"""
+        return await asyncio.gather(
+            *(self.score_lead_with_openai(lead_data, scored_at) for lead_data in leads),
+            return_exceptions=True,
+        )
 
-        if budget_range.endswith("+"):
-            try:
-                value = float(budget_range.rstrip("+").replace("k", "000").replace("$", ""))
-                return value * 1.5
-            except ValueError:
-                return 0.0
+    def process_batch(self, leads: List[Dict[str, Any]]) -> bool:
+        """
+        Score a batch of leads concurrently, then persist and publish each one
 
-        return 0.0
+        Args:
+            leads: Raw lead events from a single Kafka consume() call
 
-    def _build_scoring_metadata(self, scoring_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Prepare metadata payload for persistence"""
-        return {
-            "reasoning": scoring_result.get("reasoning"),
-            "model_version": scoring_result.get("model_version"),
-            "confidence": scoring_result.get("confidence"),
-            "mock": scoring_result.get("mock", False),
-            "scoring_input": scoring_result.get("scoring_input"),
-            "raw_response": scoring_result.get("raw_response"),
-            "scored_at": scoring_result.get("scored_at"),
-        }
+        Returns:
+            True if every lead was processed (or skipped as a duplicate)
+        """
+        self.lead_errors.clear()
+        pending = self.filter_new_leads(leads, set())
+
+        if not pending:
+            return True
+
+        # Score with OpenAI (I/O bound - overlap the round-trips)
+        # One timestamp for the whole batch
+        now = datetime.now(timezone.utc)
+        scoring_results = self.loop.run_until_complete(
+            self._score_batch(pending, now.isoformat(timespec='milliseconds'))
+        )
+
+        success = True
+        scored = []
+        for lead_data, scoring_result in zip(pending, scoring_results):
+            if isinstance(scoring_result, Exception):
+                logger.error(f"Error scoring lead {lead_data.get('lightfield_id')}: {scoring_result}")
+                sentry_sdk.capture_exception(scoring_result)
+                self.lead_errors[lead_data.get('lightfield_id')] = f"scoring error: {scoring_result}"
+                success = False
+                continue
+            scored.append((lead_data, scoring_result))
+
+        return self.persist_scored_leads(scored, now) and success
+
+    def build_lead_row(
+        self,
+        lead_data: Dict[str, Any],
+        scoring_result: ScoredLead,
+        scored_at: datetime,
+    ) -> Dict[str, Any]:
+        """Build the leads table row for a scored lead (plain column values, no ORM instance)"""
+        lightfield_id = lead_data.get('lightfield_id')
+        logger.info(f"Scored lead {lightfield_id}: {scoring_result.score:.3f} ({scoring_result.persona.value})")
+
+        company = lead_data.get('company', {})
+        contact = lead_data.get('contact', {})
 
-    def _build_public_scoring_payload(self, scoring_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Trim scoring payload for downstream events"""
         return {
-            "score": scoring_result.get("score"),
-            "persona": scoring_result.get("persona"),
-            "reasoning": scoring_result.get("reasoning"),
-            "model_version": scoring_result.get("model_version"),
-            "mock": scoring_result.get("mock", False),
-            "confidence": scoring_result.get("confidence"),
-            "scoring_input": scoring_result.get("scoring_input"),
-            "scored_at": scoring_result.get("scored_at"),
+            "lightfield_id": lightfield_id,
+            "company_name": company.get('name'),
+            "contact_name": contact.get('name'),
+            "contact_email": contact.get('email'),
+            "contact_title": contact.get('title'),
+            "industry": company.get('industry'),
+            "company_size": company.get('size'),
+            "website": company.get('website'),
+            "raw_payload": lead_data,
+            "score": scoring_result.score,
+            "persona": scoring_result.persona,
+            "scoring_metadata": scoring_result.metadata(),
+            "status": LeadStatus.SCORED,
+            "scored_at": scored_at,
         }
 
-    def process_lead(self, lead_data: Dict[str, Any]):
-        """Process a single lead: score, persist, publish"""
-        lightfield_id = lead_data.get('lightfield_id')
-        logger.info(f"Processing lead: {lightfield_id}")
+    def persist_scored_leads(self, scored: List[Tuple[Dict[str, Any], ScoredLead]], now: datetime) -> bool:
+        """
+        Insert a batch of scored leads in one statement, then publish each to leads.scored
 
-        try:
-            # Check if lead already exists
-            existing_lead = self.db.query(Lead).filter(
-                Lead.lightfield_id == lightfield_id
-            ).first()
+        Args:
+            scored: (lead_data, scoring_result) pairs
+            now: Batch timestamp used for scored_at and processed_at
 
-            if existing_lead:
-                logger.info(f"Lead {lightfield_id} already processed, skipping")
-                return
-
-            # Score with OpenAI
-            scoring_result = self.score_lead_with_openai(lead_data)
-            score_value = float(scoring_result.get('score', 0.0))
-            persona_enum = self._to_persona_enum(scoring_result.get('persona'))
-            logger.info(f"Scored lead {lightfield_id}: {score_value:.3f} ({persona_enum.value})")
-
-            # Create Lead record
-            company = lead_data.get('company', {})
-            contact = lead_data.get('contact', {})
-
-            lead = Lead(
-                lightfield_id=lightfield_id,
-                company_name=company.get('name'),
-                contact_name=contact.get('name'),
-                contact_email=contact.get('email'),
-                contact_title=contact.get('title'),
-                industry=company.get('industry'),
-                company_size=company.get('size'),
-                website=company.get('website'),
-                raw_payload=lead_data,
-                score=score_value,
-                persona=persona_enum,
-                scoring_metadata=self._build_scoring_metadata(scoring_result),
-                status=LeadStatus.SCORED,
-                scored_at=datetime.now(timezone.utc),
-            )
+        If the batch statement fails, the rows are retried one transaction each
+        so one bad row doesn't sink the rest; rows that still fail are skipped
+        and their errors recorded in lead_errors.
+
+        Returns:
+            True if every lead in the batch was persisted
+        """
+        if not scored:
+            return True
 
-            # Persist to database
-            self.db.add(lead)
+        rows = [self.build_lead_row(lead_data, scoring_result, now) for lead_data, scoring_result in scored]
+        success = True
+
+        try:
+            if (
+                settings.enable_copy_fast_path
+                and len(rows) >= COPY_THRESHOLD
+                and self.db.get_bind().dialect.name == "postgresql"
+            ):
+                inserted = self._copy_leads(rows)
+            else:
+                # Multi-row INSERT ... RETURNING (insertmanyvalues) - one commit per batch
+                inserted = self.db.execute(
+                    insert(Lead).returning(Lead.id, Lead.lightfield_id),
+                    rows,
+                ).all()
             self.db.commit()
-            self.db.refresh(lead)
 
-            logger.info(f"Persisted lead {lightfield_id} to database (ID: {lead.id})")
+        except Exception as e:
+            logger.warning(f"Batch insert of {len(rows)} leads failed ({e}), retrying individually")
+            self.db.rollback()
+            total = len(rows)
+            scored, rows, inserted = self._insert_leads_individually(scored, rows)
+            success = len(rows) == total
+
+        lead_ids = {lightfield_id: lead_id for lead_id, lightfield_id in inserted}
+        self._remember_processed(lead_ids)
+        processed_at = now.isoformat(timespec='milliseconds')
+        include_raw = settings.include_raw_in_scored_event
+        logger.info(f"Persisted {len(rows)} leads to database")
 
-            # Publish scored lead to leads.scored topic
+        for (lead_data, scoring_result), row in zip(scored, rows):
+            lightfield_id = row["lightfield_id"]
+
+            # Publish scored lead to leads.scored topic - only the delta unless the
+            # raw payload is still needed (consumers can join on lightfield_id)
             scored_event = {
-                **lead_data,
-                'scoring': self._build_public_scoring_payload(scoring_result),
-                'db_id': lead.id,
-                'processed_at': datetime.now(timezone.utc).isoformat(),
+                'lightfield_id': lightfield_id,
+                'db_id': lead_ids[lightfield_id],
+                'scoring': scoring_result.public_payload(),
+                'processed_at': processed_at,
             }
+            if include_raw:
+                scored_event = {**lead_data, **scored_event}
             self.producer.publish_scored_lead(scored_event)
 
-            # Send success metric to Sentry
-            sentry_sdk.capture_message(
-                f"Lead scored successfully: {lightfield_id}",
-                level="info",
-                extras={
-                    "score": score_value,
-                    "persona": persona_enum.value,
-                    "mock_scoring": scoring_result.get('mock', False),
-                }
-            )
+        # One breadcrumb per batch (context for later errors) instead of a Sentry event per lead
+        sentry_sdk.add_breadcrumb(
+            category="lead_scorer",
+            message=f"Scored {len(rows)} leads",
+            level="info",
+            data={"mock_scoring": sum(1 for _, scoring_result in scored if scoring_result.mock)},
+        )
+
+        return success
+
+    def _insert_leads_individually(
+        self,
+        scored: List[Tuple[Dict[str, Any], ScoredLead]],
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[List[Tuple[Dict[str, Any], ScoredLead]], List[Dict[str, Any]], List[Tuple[int, str]]]:
+        """
+        Insert rows one transaction each after a failed batch insert
 
-        except Exception as e:
-            logger.error(f"Error processing lead {lightfield_id}: {e}")
-            sentry_sdk.capture_exception(e)
-            self.db.rollback()
-            raise
+        Returns:
+            The (scored, rows, inserted) entries for rows that were persisted
+        """
+        kept_scored, kept_rows, inserted = [], [], []
+        for pair, row in zip(scored, rows):
+            try:
+                inserted.extend(self.db.execute(
+                    insert(Lead).values(row).returning(Lead.id, Lead.lightfield_id)
+                ).all())
+                self.db.commit()
+            except Exception as e:
+                logger.error(f"Error persisting lead {row['lightfield_id']}: {e}")
+                sentry_sdk.capture_exception(e)
+                self.db.rollback()
+                # DBAPI message only - the SQLAlchemy wrapper embeds the full statement and params
+                self.lead_errors[row["lightfield_id"]] = f"insert error: {getattr(e, 'orig', e)}"
+                continue
+            kept_scored.append(pair)
+            kept_rows.append(row)
+        return kept_scored, kept_rows, inserted
+
+    def _copy_leads(self, rows: List[Dict[str, Any]]) -> List[Tuple[int, str]]:
+        """
+        Bulk load lead rows with PostgreSQL COPY (large replays/backfills)
+
+        Runs on the session's connection, so it shares the batch transaction.
+
+        Returns:
+            (id, lightfield_id) pairs for the loaded rows
+        """
+        raw_conn = self.db.connection().connection.driver_connection
+        with raw_conn.cursor() as cursor:
+            with cursor.copy(COPY_LEADS_SQL) as copy:
+                for row in rows:
+                    copy.write_row((
+                        row["lightfield_id"],
+                        row["company_name"],
+                        row["contact_name"],
+                        row["contact_email"],
+                        row["contact_title"],
+                        row["industry"],
+                        row["company_size"],
+                        row["website"],
+                        Json(row["raw_payload"]),
+                        row["score"],
+                        row["persona"].name,  # SQLEnum stores member names
+                        Json(row["scoring_metadata"]),
+                        row["status"].name,
+                        row["scored_at"],
+                        0,  # outreach_count (ORM default not applied by COPY)
+                        0,  # response_count
+                    ))
+
+        # COPY has no RETURNING - read the generated ids back by lightfield_id
+        return self.db.execute(
+            select(Lead.id, Lead.lightfield_id)
+            .where(Lead.lightfield_id.in_([row["lightfield_id"] for row in rows]))
+        ).all()
 
     def run(self):
         """Main consumer loop"""
         logger.info("Starting lead scorer worker...")
 
         try:
-            while not shutdown_flag:
-                msg = self.consumer.poll(timeout=1.0)
-
-                if msg is None:
+            while not shutdown_event.is_set():
+                msgs = self.consumer.consume(
+                    num_messages=settings.kafka_batch_size,
+                    timeout=settings.kafka_poll_timeout_ms / 1000,
+                )
+
+                # Stop as soon as shutdown is requested - uncommitted messages are redelivered
+                if shutdown_event.is_set():
+                    break
+
+                if not msgs:
+                    if self.process_idle():
+                        self.commit_batch()
                     continue
 
-                if msg.error():
-                    raise KafkaException(msg.error())
-
-                # Parse message
-                try:
-                    lead_data = json.loads(msg.value().decode('utf-8'))
-                    self.process_lead(lead_data)
-
-                    # Commit offset after successful processing
-                    self.consumer.commit(msg)
-
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Don't commit - message will be reprocessed
+                # Parse messages
+                leads = []
+                for msg in msgs:
+                    if msg.error():
+                        logger.error(f"Kafka error: {msg.error()}")
+                        continue
+
+                    try:
+                        leads.append(orjson.loads(msg.value()))
+                    except Exception as e:
+                        # Malformed payloads never succeed - dead-letter without retrying
+                        logger.error(f"Error parsing message: {e}")
+                        self.producer.publish_dead_letter(msg.value(), msg.key(), f"parse error: {e}")
+
+                # Commit offsets once, after the whole batch is scored and persisted
+                # (or its failed leads have been dead-lettered)
+                if self.process_with_retry(leads, msgs):
+                    self.commit_batch()
 
         except KeyboardInterrupt:
             logger.info("Interrupted by user")
@@ -337,22 +673,310 @@ class LeadScorerWorker:
             logger.info("Shutting down worker...")
             self.cleanup()
 
+    def process_with_retry(self, leads: List[Dict[str, Any]], msgs: List[Message]) -> bool:
+        """
+        Process a batch, retrying with capped exponential backoff
+
+        After MAX_PROCESSING_ATTEMPTS, leads that still aren't persisted are
+        published to the DLQ so one bad lead can't stall the partition. If they
+        can't be dead-lettered either (database outage), the batch is rewound so
+        a later commit can't move past it.
+
+        Args:
+            leads: Parsed lead events
+            msgs: The Kafka messages they came from
+
+        Returns:
+            True if consumed offsets should be committed
+        """
+        error = "processing failed"
+        for attempt in range(1, MAX_PROCESSING_ATTEMPTS + 1):
+            try:
+                if self.process_batch(leads):
+                    return True
+            except Exception as e:
+                logger.error(f"Error processing batch: {e}")
+                self.db.rollback()
+                error = str(e)
+
+            if attempt < MAX_PROCESSING_ATTEMPTS:
+                delay = min(RETRY_BACKOFF_MAX_SECONDS, 2 ** attempt) + random.random()
+                logger.warning(f"Batch attempt {attempt} failed, retrying in {delay:.1f}s")
+                if shutdown_event.wait(delay):
+                    # Don't commit - messages will be redelivered after restart
+                    return False
+
+        if not self.dead_letter_unprocessed(leads, error):
+            self.rewind(msgs)
+            return False
+        return True
+
+    def dead_letter_unprocessed(self, leads: List[Dict[str, Any]], error: str) -> bool:
+        """
+        Publish leads that still aren't persisted to the DLQ
+
+        Args:
+            leads: Leads from the failed batch (persisted ones are skipped)
+            error: Fallback reason for leads without a recorded per-lead error
+
+        Returns:
+            True if consumed offsets may be committed
+        """
+        try:
+            failed = self.filter_new_leads(leads, set())
+        except Exception as e:
+            # DB unreachable - don't dead-letter healthy leads during an outage
+            logger.error(f"Could not determine unprocessed leads: {e}")
+            self.db.rollback()
+            return False
+
+        logger.error(f"Dead-lettering {len(failed)} unprocessed leads")
+        for lead_data in failed:
+            lightfield_id = lead_data.get('lightfield_id') or ''
+            reason = self.lead_errors.get(lightfield_id, error)
+            self.producer.publish_dead_letter(orjson.dumps(lead_data), lightfield_id.encode('utf-8'), reason)
+        return True
+
+    def commit_batch(self):
+        """Flush this batch's leads.scored events, then commit consumed offsets"""
+        # At-least-once: offsets only move once downstream events are delivered
+        remaining = self.producer.flush(timeout=5.0)
+        if remaining:
+            logger.warning(f"{remaining} scored events undelivered, not committing offsets")
+            return
+
+        # Async commit at the batch boundary - the coordinator round-trip happens in the background
+        offsets = [tp for tp in self.consumer.position(self.consumer.assignment()) if tp.offset >= 0]
+        if offsets:
+            self.consumer.commit(offsets=offsets, asynchronous=True)
+            self.committed_offsets = offsets
+
+    def rewind(self, msgs: List[Message]):
+        """Seek each partition back to the earliest offset in msgs so they are consumed again"""
+        first_offsets: Dict[tuple, int] = {}
+        for msg in msgs:
+            if msg.error():
+                continue
+            partition = (msg.topic(), msg.partition())
+            first_offsets[partition] = min(first_offsets.get(partition, msg.offset()), msg.offset())
+
+        for (topic, partition), offset in first_offsets.items():
+            self.consumer.seek(TopicPartition(topic, partition, offset))
+
+    def process_idle(self) -> bool:
+        """
+        Hook called when consume() returns no messages
+
+        Returns:
+            True if consumed offsets should be committed
+        """
+        return False
+
     def cleanup(self):
         """Clean up resources"""
         logger.info("Closing consumer and database connection...")
-        self.consumer.close()
-        self.db.close()
-        self.producer.close()
+        try:
+            self.db.close()
+            self.producer.close()
+            self.loop.run_until_complete(self.scoring_client.aclose())
+            self.loop.close()
+        finally:
+            # Make sure the last async commit landed (never commits unprocessed offsets),
+            # and always leave the consumer group cleanly, even if other teardown fails
+            try:
+                if self.committed_offsets:
+                    self.consumer.commit(offsets=self.committed_offsets, asynchronous=False)
+            except KafkaException as e:
+                logger.error(f"Final offset commit failed: {e}")
+            finally:
+                self.consumer.close()
         logger.info("Worker shutdown complete")
 
 
+class BatchLeadScorerWorker(LeadScorerWorker):
+    """
+    Lead scorer that buffers leads and scores them through the OpenAI Batch API
+
+    Cheaper and higher-throughput than real-time scoring, at the cost of up to
+    24h turnaround - intended for backfills and bulk reprocessing. Offsets are
+    only committed once a buffered batch has been scored and persisted.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buffer: List[Dict[str, Any]] = []
+        self.buffer_ids: set = set()
+        self.buffer_started: Optional[float] = None
+        # Batch API results for buffered leads (None if missing from the output),
+        # kept so a failed persist isn't resubmitted
+        self.buffer_results: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.flush_attempts = 0
+
+    def process_batch(self, leads: List[Dict[str, Any]]) -> bool:
+        """Buffer new leads; submit once the buffer is full or the window elapses"""
+        new_leads = self.filter_new_leads(leads, self.buffer_ids)
+        if new_leads and self.buffer_started is None:
+            self.buffer_started = time.monotonic()
+        self.buffer.extend(new_leads)
+
+        if len(self.buffer) >= settings.openai_batch_max_leads:
+            return self.flush_buffer()
+        return self.process_idle()
+
+    def process_with_retry(self, leads: List[Dict[str, Any]], msgs: List[Message]) -> bool:
+        """Buffer leads without retrying - False here means "not flushed yet", not a failure"""
+        try:
+            return self.process_batch(leads)
+        except Exception as e:
+            # The leads never reached the buffer - consume them again rather than
+            # letting the next flush commit past them
+            logger.error(f"Error processing batch: {e}")
+            self.db.rollback()
+            self.rewind(msgs)
+            return False
+
+    def process_idle(self) -> bool:
+        """Submit a partially filled buffer once the batching window elapses"""
+        if self.buffer_started is None:
+            return False
+        if time.monotonic() - self.buffer_started < settings.openai_batch_window_seconds:
+            return False
+        return self.flush_buffer()
+
+    def flush_buffer(self) -> bool:
+        """
+        Score buffered leads via the Batch API, then persist and publish them
+
+        A failed submission or persist keeps the affected leads buffered for
+        another attempt after the batching window. After MAX_FLUSH_ATTEMPTS the
+        buffer is mock-scored instead of being resubmitted, and leads that still
+        fail to persist are dead-lettered.
+
+        Returns:
+            True once every buffered lead was persisted or dead-lettered
+            (offsets may be committed)
+        """
+        if not self.buffer:
+            return False
+
+        scoring_inputs = {
+            lead_data['lightfield_id']: self._scoring_input_for(lead_data)
+            for lead_data in self.buffer
+        }
+        unscored = {
+            lightfield_id: scoring_input
+            for lightfield_id, scoring_input in scoring_inputs.items()
+            if lightfield_id not in self.buffer_results
+        }
+
+        if unscored and self.flush_attempts >= MAX_FLUSH_ATTEMPTS:
+            logger.warning(f"Giving up on the Batch API after {self.flush_attempts} attempts, mock-scoring buffer")
+        elif unscored:
+            try:
+                results = self._run_openai_batch(unscored)
+            except Exception as e:
+                # Keep the buffer; the next idle tick or batch retries the submission
+                logger.error(f"OpenAI batch failed: {e}")
+                sentry_sdk.capture_exception(e)
+                self.flush_attempts += 1
+                self.buffer_started = time.monotonic()
+                return False
+
+            if results is None:
+                return False  # Shutting down mid-batch - messages will be reprocessed
+            self.buffer_results.update(
+                (lightfield_id, results.get(lightfield_id)) for lightfield_id in unscored
+            )
+
+        now = datetime.now(timezone.utc)
+        scored_at = now.isoformat(timespec='milliseconds')
+        scored = []
+        for lead_data in self.buffer:
+            lightfield_id = lead_data['lightfield_id']
+            scoring_input = scoring_inputs[lightfield_id]
+            # Leads missing from the output fall back to mock scoring, as in real-time mode
+            result = self.buffer_results.get(lightfield_id) or self.scoring_client._mock_score_lead(scoring_input)
+            scored.append((lead_data, self._build_scoring_result(scoring_input, result, scored_at)))
+
+        self.lead_errors.clear()
+        if not self.persist_scored_leads(scored, now):
+            # Keep only the leads that didn't persist; offsets stay put until they do
+            self.flush_attempts += 1
+            self.buffer = [
+                lead_data for lead_data in self.buffer
+                if lead_data['lightfield_id'] in self.lead_errors
+            ]
+            self.buffer_ids = {lead_data['lightfield_id'] for lead_data in self.buffer}
+            self.buffer_results = {
+                lightfield_id: result
+                for lightfield_id, result in self.buffer_results.items()
+                if lightfield_id in self.buffer_ids
+            }
+            self.buffer_started = time.monotonic()
+            logger.warning(f"Flush attempt {self.flush_attempts} failed, keeping {len(self.buffer)} leads buffered")
+
+            # Leads that keep failing go to the DLQ so offsets can move past them
+            if self.flush_attempts < MAX_FLUSH_ATTEMPTS or not self.dead_letter_unprocessed(
+                self.buffer, "batch persist failed"
+            ):
+                return False
+
+        self.buffer = []
+        self.buffer_ids = set()
+        self.buffer_results = {}
+        self.buffer_started = None
+        self.flush_attempts = 0
+        return True
+
+    def _run_openai_batch(self, scoring_inputs: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Submit a batch job and wait for its results (None if interrupted by shutdown)"""
+        if self.scoring_client.mock_mode:
+            return {}
+
+        lines = [
+            self.scoring_client.build_batch_line(lightfield_id, scoring_input)
+            for lightfield_id, scoring_input in scoring_inputs.items()
+        ]
+        batch_id = self.scoring_client.submit_batch(lines)
+
+        # Pause fetching while the job runs, but keep calling consume() so the
+        # group doesn't evict us for exceeding max.poll.interval.ms
+        self.consumer.pause(self.consumer.assignment())
+        try:
+            while True:
+                batch = self.scoring_client.get_batch(batch_id)
+                status = batch.get("status")
+
+                if status == "completed":
+                    logger.info(f"OpenAI batch {batch_id} completed")
+                    return self.scoring_client.fetch_batch_results(batch["output_file_id"])
+                if status in ("failed", "expired", "cancelled"):
+                    raise RuntimeError(f"OpenAI batch {batch_id} ended with status {status}")
+                if shutdown_event.is_set():
+                    logger.info(f"Shutdown requested while waiting on OpenAI batch {batch_id}")
+                    return None
+
+                logger.info(f"OpenAI batch {batch_id} is {status}, waiting...")
+                # Short consume() calls so a shutdown request is noticed promptly
+                deadline = time.monotonic() + settings.openai_batch_poll_seconds
+                while not shutdown_event.is_set() and time.monotonic() < deadline:
+                    msgs = self.consumer.consume(num_messages=1, timeout=settings.kafka_poll_timeout_ms / 1000)
+                    if msgs:
+                        # A rebalance assigned partitions that aren't paused - hand the
+                        # messages back and pause the new assignment
+                        self.rewind(msgs)
+                        self.consumer.pause(self.consumer.assignment())
+        finally:
+            self.consumer.resume(self.consumer.assignment())
+
+
 def main():
     """Entry point"""
     logger.info("=" * 80)
     logger.info("LEAD SCORER WORKER")
     logger.info("=" * 80)
 
-    worker = LeadScorerWorker()
+    worker = BatchLeadScorerWorker() if settings.openai_batch_mode else LeadScorerWorker()
     worker.run()
 
 
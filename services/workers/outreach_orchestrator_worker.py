@@ -2,15 +2,18 @@
 Kafka consumer worker for orchestrating outreach
 Consumes from leads.scored, generates personalized messages, sends via Lightfield, publishes events
 """
-import json
 import logging
+import random
 import sys
 import signal
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
-from confluent_kafka import Consumer, KafkaException
+from confluent_kafka import Consumer, KafkaException, TopicPartition
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+import orjson
 import sentry_sdk
 
 # Add repository paths for local imports
@@ -28,6 +31,7 @@ from app.models.experiment import Experiment
 from app.models.outreach_template import OutreachTemplate
 from app.models.outreach_log import OutreachLog, OutreachStatus
 from app.services import (
+    KafkaProducerService,
     get_kafka_producer,
     get_truefoundry_client,
     get_lightfield_client,
@@ -39,6 +43,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Active experiments/templates are near-static reference data - cache them briefly
+REFERENCE_CACHE_TTL_SECONDS = 30.0
+_experiment_cache: Dict[str, Any] = {"expires_at": 0.0, "arms": []}
+_template_cache: Dict[str, Tuple[float, Optional[OutreachTemplate]]] = {}
+
+# Dedicated RNG for Thompson sampling (not shared with other users of the random module)
+_RNG = random.Random()
+
+# Leads scoring below this are not contacted
+MIN_OUTREACH_SCORE = 0.5
+
 # Graceful shutdown flag
 shutdown_flag = False
 
@@ -66,46 +81,56 @@ def select_experiment(db: Session, lead: Lead) -> Optional[Experiment]:
     Returns:
         Selected experiment or None if no active experiments
     """
-    import random
-
-    # Get all active experiments for this persona
-    experiments = (
-        db.query(Experiment)
-        .filter(Experiment.is_active == True)
-        .all()
-    )
+    # Get all active experiments (cached briefly - posteriors move slowly)
+    now = time.monotonic()
+    if now >= _experiment_cache["expires_at"]:
+        _experiment_cache["arms"] = (
+            db.query(Experiment.id, Experiment.experiment_id, Experiment.alpha, Experiment.beta)
+            .filter(Experiment.is_active == True)
+            .all()
+        )
+        _experiment_cache["expires_at"] = now + REFERENCE_CACHE_TTL_SECONDS
 
+    experiments = _experiment_cache["arms"]
     if not experiments:
         logger.warning("No active experiments found")
         return None
 
-    # Thompson Sampling: sample from Beta distribution for each experiment
-    best_experiment = None
-    best_sample = -1
-
-    for exp in experiments:
-        # Sample from Beta(alpha, beta)
-        sample = random.betavariate(exp.alpha, exp.beta)
-        logger.debug(f"Experiment {exp.experiment_id}: sampled {sample:.4f} (α={exp.alpha}, β={exp.beta})")
+    # Thompson Sampling: sample from Beta(alpha, beta) for each experiment, pick the argmax
+    betavariate = _RNG.betavariate
+    samples = [betavariate(exp.alpha, exp.beta) for exp in experiments]
+    best_index = max(range(len(samples)), key=samples.__getitem__)
+    best_experiment = experiments[best_index]
+    best_sample = samples[best_index]
 
-        if sample > best_sample:
-            best_sample = sample
-            best_experiment = exp
+    if logger.isEnabledFor(logging.DEBUG):
+        for exp, sample in zip(experiments, samples):
+            logger.debug(f"Experiment {exp.experiment_id}: sampled {sample:.4f} (α={exp.alpha}, β={exp.beta})")
 
     logger.info(f"Selected experiment: {best_experiment.experiment_id} (sample={best_sample:.4f})")
-    return best_experiment
+    # Only the winner is loaded as an ORM instance (identity map hit within a batch)
+    return db.get(Experiment, best_experiment.id)
 
 
 def get_template_for_experiment(db: Session, experiment: Experiment) -> Optional[OutreachTemplate]:
     """Get an active template for the given experiment"""
-    template = (
-        db.query(OutreachTemplate)
-        .filter(
-            OutreachTemplate.experiment_id == experiment.experiment_id,
-            OutreachTemplate.is_active == True,
+    now = time.monotonic()
+    cached = _template_cache.get(experiment.experiment_id)
+    if cached is not None and now < cached[0]:
+        template = cached[1]
+    else:
+        template = (
+            db.query(OutreachTemplate)
+            .filter(
+                OutreachTemplate.experiment_id == experiment.experiment_id,
+                OutreachTemplate.is_active == True,
+            )
+            .first()
         )
-        .first()
-    )
+        if template is not None:
+            # Detach so the loaded (read-only) template outlives this session
+            db.expunge(template)
+        _template_cache[experiment.experiment_id] = (now + REFERENCE_CACHE_TTL_SECONDS, template)
 
     if not template:
         logger.warning(f"No active template found for experiment {experiment.experiment_id}")
@@ -113,7 +138,31 @@ def get_template_for_experiment(db: Session, experiment: Experiment) -> Optional
     return template
 
 
-def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
+def event_skip_reason(event: Dict[str, Any]) -> Optional[str]:
+    """Why outreach can be skipped from the scored event alone (None if the lead must be loaded)"""
+    score = (event.get("scoring") or {}).get("score")
+    if score is not None and score < MIN_OUTREACH_SCORE:
+        return f"score too low ({score})"
+
+    return None
+
+
+def load_leads(db: Session, lightfield_ids: List[str]) -> Dict[str, Lead]:
+    """Load the leads for a batch of scored events with one IN query"""
+    if not lightfield_ids:
+        return {}
+    return {
+        lead.lightfield_id: lead
+        for lead in db.execute(select(Lead).where(Lead.lightfield_id.in_(lightfield_ids))).scalars()
+    }
+
+
+def process_scored_lead(
+    event: Dict[str, Any],
+    db: Session,
+    lead: Optional[Lead] = None,
+    kafka_producer: Optional[KafkaProducerService] = None,
+) -> bool:
     """
     Process a scored lead event and orchestrate outreach
 
@@ -128,6 +177,8 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
     Args:
         event: Scored lead event from Kafka
         db: Database session
+        lead: The event's lead if already loaded (looked up by lightfield_id otherwise)
+        kafka_producer: Producer for outreach events (shared singleton if omitted)
 
     Returns:
         True if successful, False otherwise
@@ -138,8 +189,15 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
             logger.error("Missing lightfield_id in event")
             return False
 
-        # Get lead from database
-        lead = db.query(Lead).filter(Lead.lightfield_id == lightfield_id).first()
+        # Short-circuit on the event's own score before touching the DB
+        skip_reason = event_skip_reason(event)
+        if skip_reason:
+            logger.info(f"Lead {lightfield_id} {skip_reason}, skipping outreach")
+            return True
+
+        # Get lead from database (unless preloaded with the rest of the batch)
+        if lead is None:
+            lead = db.query(Lead).filter(Lead.lightfield_id == lightfield_id).first()
         if not lead:
             logger.error(f"Lead not found: {lightfield_id}")
             return False
@@ -149,8 +207,8 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
             logger.info(f"Lead {lightfield_id} already contacted (status={lead.status})")
             return True
 
-        # Skip if score is too low (< 0.5)
-        if lead.score is None or lead.score < 0.5:
+        # Skip if score is too low
+        if lead.score is None or lead.score < MIN_OUTREACH_SCORE:
             logger.info(f"Lead {lightfield_id} score too low ({lead.score}), skipping outreach")
             return True
 
@@ -198,8 +256,11 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
             logger.error(f"Failed to send message: {send_result.get('error')}")
             return False
 
-        # Create outreach log
-        outreach_log = OutreachLog(
+        # One timestamp for the log row, lead update and outreach event
+        now = datetime.now(timezone.utc)
+
+        # Create outreach log (Core insert - the row is never read back as an object)
+        db.execute(insert(OutreachLog).values(
             lead_id=lead.id,
             experiment_id=experiment.experiment_id,
             template_id=template.template_id,
@@ -209,28 +270,44 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
             sent_via=send_result.get("provider", "lightfield"),
             external_message_id=send_result.get("message_id"),
             status=OutreachStatus.SENT,
-            sent_at=send_result.get("sent_at") or datetime.now(timezone.utc),
-        )
-        db.add(outreach_log)
+            sent_at=send_result.get("sent_at") or now,
+        ))
 
         # Update lead
         lead.status = LeadStatus.CONTACTED
         lead.experiment_id = experiment.experiment_id
-        lead.contacted_at = datetime.now(timezone.utc)
+        lead.contacted_at = now
         lead.outreach_count = (lead.outreach_count or 0) + 1
 
-        # Update experiment metrics
-        experiment.leads_assigned = (experiment.leads_assigned or 0) + 1
-        experiment.outreach_sent = (experiment.outreach_sent or 0) + 1
-        experiment.update_metrics()
+        # Update experiment metrics atomically in SQL - the in-memory Experiment may be
+        # stale (kept across the batch), and the feedback worker and other replicas
+        # update the same row concurrently. SET expressions read the pre-update values.
+        leads_assigned = func.coalesce(Experiment.leads_assigned, 0) + 1
+        outreach_sent = func.coalesce(Experiment.outreach_sent, 0) + 1
+        db.execute(
+            update(Experiment)
+            .where(Experiment.id == experiment.id)
+            .values(
+                leads_assigned=leads_assigned,
+                outreach_sent=outreach_sent,
+                **Experiment.metric_rates(
+                    func.coalesce(Experiment.conversions, 0),
+                    leads_assigned,
+                    func.coalesce(Experiment.responses_received, 0),
+                    outreach_sent,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         db.commit()
 
         # Publish outreach event to Kafka
-        kafka_producer = get_kafka_producer()
+        if kafka_producer is None:
+            kafka_producer = get_kafka_producer()
         outreach_event = {
             "event_type": "outreach.sent",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now.isoformat(),
             "lead_id": lead.id,
             "lightfield_id": lead.lightfield_id,
             "experiment_id": experiment.experiment_id,
@@ -239,12 +316,22 @@ def process_scored_lead(event: Dict[str, Any], db: Session) -> bool:
             "message_id": send_result.get("message_id"),
             "subject": message.get("subject", ""),
         }
-        kafka_producer.producer.produce(
-            "outreach.events",
-            key=lightfield_id.encode('utf-8'),
-            value=json.dumps(outreach_event).encode('utf-8'),
-        )
-        kafka_producer.producer.flush()
+        # Enqueue only - librdkafka batches sends; main() flushes once per consumed batch.
+        # Key and value are encoded once so a retry reuses the same bytes.
+        key = lightfield_id.encode('utf-8')
+        value = orjson.dumps(outreach_event)
+        try:
+            kafka_producer.producer.produce(
+                "outreach.events", key=key, value=value, callback=kafka_producer.delivery_report
+            )
+        except BufferError:
+            # Local queue is full - let librdkafka drain it, then retry once
+            kafka_producer.producer.poll(1.0)
+            kafka_producer.producer.produce(
+                "outreach.events", key=key, value=value, callback=kafka_producer.delivery_report
+            )
+        # Serve delivery callbacks without blocking on the broker
+        kafka_producer.producer.poll(0)
 
         logger.info(
             f"✅ Outreach sent: lead={lightfield_id}, "
@@ -271,56 +358,113 @@ def main():
         'group.id': 'outreach-orchestrator',
         'auto.offset.reset': 'earliest',
         'enable.auto.commit': False,
+        # Let the broker accumulate real batches instead of answering each fetch immediately,
+        # and keep a deep local prefetch queue so consume() is usually served from memory
+        'fetch.min.bytes': 1048576,
+        'fetch.wait.max.ms': settings.kafka_fetch_wait_max_ms,
+        'fetch.message.max.bytes': 1048576,
+        'queued.min.messages': 100000,
+        'queued.max.messages.kbytes': 65536,
     }
 
     consumer = Consumer(consumer_config)
     consumer.subscribe(['leads.scored'])
 
+    # One producer handle for the worker's lifetime
+    kafka_producer = get_kafka_producer()
+
     logger.info(f"📡 Subscribed to leads.scored (brokers: {settings.redpanda_brokers})")
 
     processed_count = 0
     error_count = 0
+    # Offsets of the last async commit, re-committed synchronously on shutdown
+    committed_offsets: List[TopicPartition] = []
 
     try:
         while not shutdown_flag:
-            msg = consumer.poll(timeout=1.0)
+            msgs = consumer.consume(
+                num_messages=settings.kafka_batch_size,
+                timeout=settings.kafka_poll_timeout_ms / 1000,
+            )
 
-            if msg is None:
+            if not msgs:
                 continue
 
-            if msg.error():
-                logger.error(f"Kafka error: {msg.error()}")
-                continue
+            events = []
+            for msg in msgs:
+                if msg.error():
+                    logger.error(f"Kafka error: {msg.error()}")
+                    continue
 
-            # Process message
+                try:
+                    events.append(orjson.loads(msg.value()))
+                except Exception as e:
+                    error_count += 1
+                    logger.error(f"Error decoding message: {e}", exc_info=True)
+                    sentry_sdk.capture_exception(e)
+
+            batch_succeeded = False
+            # Per-batch session: don't expire the preloaded leads/experiments on every
+            # per-lead commit, which would re-SELECT each one on next access
+            db = SessionLocal(expire_on_commit=False)
             try:
-                event = json.loads(msg.value().decode('utf-8'))
-                logger.info(f"Processing scored lead: {event.get('lightfield_id')}")
-
-                db = SessionLocal()
+                # One lookup for the whole batch instead of a SELECT per event,
+                # skipping events already ruled out by their score
                 try:
-                    success = process_scored_lead(event, db)
-                    if success:
-                        processed_count += 1
-                        consumer.commit()
-                    else:
+                    leads_by_id = load_leads(db, [
+                        event.get("lightfield_id") for event in events
+                        if event_skip_reason(event) is None
+                    ])
+                except Exception as e:
+                    logger.error(f"Error loading leads for batch: {e}", exc_info=True)
+                    db.rollback()
+                    leads_by_id = {}  # Fall back to per-event lookups
+
+                for event in events:
+                    # Process message
+                    try:
+                        logger.info(f"Processing scored lead: {event.get('lightfield_id')}")
+
+                        lead = leads_by_id.get(event.get("lightfield_id"))
+                        if process_scored_lead(event, db, lead, kafka_producer):
+                            processed_count += 1
+                            batch_succeeded = True
+                        else:
+                            error_count += 1
+                            logger.warning(f"Failed to process lead {event.get('lightfield_id')}")
+
+                    except Exception as e:
                         error_count += 1
-                        logger.warning(f"Failed to process lead {event.get('lightfield_id')}")
-
-                finally:
-                    db.close()
-
-            except Exception as e:
-                error_count += 1
-                logger.error(f"Error processing message: {e}", exc_info=True)
-                sentry_sdk.capture_exception(e)
+                        logger.error(f"Error processing message: {e}", exc_info=True)
+                        sentry_sdk.capture_exception(e)
+
+            finally:
+                db.close()
+
+            # One offset commit per consumed batch instead of one per message,
+            # after this batch's outreach events have been delivered
+            if batch_succeeded:
+                if kafka_producer.flush(timeout=5.0):
+                    logger.warning("Outreach events undelivered, not committing offsets")
+                else:
+                    offsets = [tp for tp in consumer.position(consumer.assignment()) if tp.offset >= 0]
+                    if offsets:
+                        consumer.commit(offsets=offsets, asynchronous=True)
+                        committed_offsets = offsets
 
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
 
     finally:
         logger.info(f"Shutting down... (processed={processed_count}, errors={error_count})")
+        # Make sure the last async commit landed (never commits unprocessed offsets)
+        try:
+            if committed_offsets:
+                consumer.commit(offsets=committed_offsets, asynchronous=False)
+        except KafkaException as e:
+            logger.error(f"Final offset commit failed: {e}")
         consumer.close()
+        kafka_producer.close()
 
 
 if __name__ == "__main__":